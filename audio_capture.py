@@ -4,6 +4,9 @@ import threading
 import numpy as np
 import sounddevice as sd
 
+import config
+from ring_buffer import AudioRingBuffer
+
 
 class AudioRecorder:
     """Records audio from microphone into a buffer.
@@ -73,3 +76,103 @@ class AudioRecorder:
         with self._lock:
             total_samples = sum(len(chunk) for chunk in self._buffer)
         return total_samples / self.sample_rate
+
+
+class ContinuousRecorder:
+    """Keeps an input stream open and captures into a ring buffer.
+
+    start() only marks a position in the buffer, backdated by a pre-roll
+    so speech that began just before the key press is kept. stop()
+    returns everything captured since that mark.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int | None = None,
+        channels: int | None = None,
+        buffer_sec: float | None = None,
+        preroll_sec: float | None = None,
+    ):
+        """Initialize recorder.
+
+        Args:
+            sample_rate: Sample rate in Hz. Defaults to 24000 for Moshi.
+            channels: Number of channels. Defaults to 1 (mono).
+            buffer_sec: Ring buffer length. Defaults to config.CAPTURE_BUFFER_SEC.
+            preroll_sec: Audio kept from before start(). Defaults to config.PREROLL_SEC.
+        """
+        self.sample_rate = sample_rate or 24000  # Moshi expects 24kHz
+        self.channels = channels or 1
+        buffer_sec = buffer_sec or config.CAPTURE_BUFFER_SEC
+        self.preroll_sec = config.PREROLL_SEC if preroll_sec is None else preroll_sec
+        self.ring = AudioRingBuffer(int(buffer_sec * self.sample_rate))
+        self._stream: sd.InputStream | None = None
+        self._mark: int | None = None
+
+    @property
+    def is_recording(self) -> bool:
+        """Whether a recording has been started and not yet stopped."""
+        return self._mark is not None
+
+    @property
+    def start_position(self) -> int | None:
+        """Ring buffer position where the current recording begins."""
+        return self._mark
+
+    def _audio_callback(self, indata: np.ndarray, frames: int, time_info, status):
+        """Callback for audio stream."""
+        if status:
+            print(f"Audio status: {status}")
+        self.ring.write(indata[:, 0])
+
+    def open(self) -> None:
+        """Open the input stream and start filling the ring buffer."""
+        if self._stream is not None:
+            return
+
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype=np.float32,
+            callback=self._audio_callback
+        )
+        self._stream.start()
+
+    def close(self) -> None:
+        """Close the input stream."""
+        if self._stream:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self._mark = None
+
+    def start(self, preroll_sec: float | None = None) -> None:
+        """Mark the start of a recording, including the pre-roll.
+
+        Args:
+            preroll_sec: Override the configured pre-roll (e.g. 0 right
+                after playback, so the assistant's own voice is not kept).
+        """
+        if self.is_recording:
+            return
+        preroll_sec = self.preroll_sec if preroll_sec is None else preroll_sec
+        preroll = int(preroll_sec * self.sample_rate)
+        self._mark = max(self.ring.oldest, self.ring.position - preroll)
+
+    def stop(self) -> np.ndarray:
+        """End the recording and return audio captured since start().
+
+        Returns:
+            Audio data as numpy array, or empty array if not recording.
+        """
+        if not self.is_recording:
+            return np.array([], dtype=np.float32)
+
+        mark, self._mark = self._mark, None
+        return self.ring.read(mark)
+
+    def get_duration(self) -> float:
+        """Get current recording duration in seconds."""
+        if not self.is_recording:
+            return 0.0
+        return (self.ring.position - self._mark) / self.sample_rate
@@ -1,64 +1,127 @@
 """Audio playback module using sounddevice."""
 
-import queue
+import sys
 import threading
+from time import perf_counter
+
 import numpy as np
 import sounddevice as sd
 
+from ring_buffer import PlaybackRingBuffer
+
 
 class StreamingAudioPlayer:
-    """Plays audio chunks as they arrive with minimal latency."""
+    """Plays audio chunks as they arrive with minimal latency.
+
+    Chunks are copied into a preallocated ring buffer by the producer; the
+    audio callback only copies out of it, so the real-time thread never
+    allocates or waits on a lock. With an AdaptivePrebuffer, playback starts
+    only once enough audio is buffered to ride out a slow producer, and
+    every utterance's underruns are reported back to it. Lead-in audio
+    (e.g. a filler clip) queued before the first chunk bypasses that hold
+    and is left out of what the prebuffer learns.
+    """
 
     DEFAULT_SAMPLE_RATE = 24000
     DEFAULT_BLOCKSIZE = 1024  # Small blocks for low latency
-
-    def __init__(self, sample_rate: int | None = None, blocksize: int | None = None):
+    DEFAULT_BUFFER_SEC = 30.0
+
+    def __init__(
+        self,
+        sample_rate: int | None = None,
+        blocksize: int | None = None,
+        buffer_sec: float | None = None,
+        prebuffer=None,
+    ):
         """Initialize streaming player.
 
         Args:
             sample_rate: Sample rate in Hz. Defaults to 24000.
             blocksize: Audio block size. Smaller = lower latency.
+            buffer_sec: Audio buffered before add_chunk() blocks, so a fast
+                producer cannot run arbitrarily far ahead. Defaults to 30 s.
+            prebuffer: AdaptivePrebuffer that sets the start delay and learns
+                from this player's underruns. Playback starts at once if None.
         """
         self.sample_rate = sample_rate or self.DEFAULT_SAMPLE_RATE
         self.blocksize = blocksize or self.DEFAULT_BLOCKSIZE
-        self._queue: queue.Queue[np.ndarray | None] = queue.Queue()
+        buffer_sec = buffer_sec or self.DEFAULT_BUFFER_SEC
+        self._ring = PlaybackRingBuffer(int(buffer_sec * self.sample_rate))
         self._stream: sd.OutputStream | None = None
         self._finished = threading.Event()
-        self._buffer = np.array([], dtype=np.float32)
+        self._eof = False
+        self.prebuffer = prebuffer
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.callback_count = 0
+        self.callback_total_sec = 0.0
+        self.callback_max_sec = 0.0
+        self.underruns = 0
+        self.underrun_sec = 0.0
+        self._in_underrun = False
+        self._playing = False
+        self._samples_added = 0
+        self._lead_in_added = 0  # Written by the producer
+        self._lead_in_played = 0  # Written by the callback
+        self._first_chunk_at: float | None = None
+        self._last_chunk_at = 0.0
+        self._prebuffer_sec = self.prebuffer.target_sec() if self.prebuffer is not None else 0.0
+        self._prebuffer_samples = min(int(self._prebuffer_sec * self.sample_rate), self._ring.capacity)
 
     def _audio_callback(self, outdata, frames, time, status):
         """Callback that feeds audio data to the output stream."""
-        needed = frames
+        start = perf_counter()
         filled = 0
-
-        while filled < needed:
-            # First use any buffered data
-            if len(self._buffer) > 0:
-                take = min(len(self._buffer), needed - filled)
-                outdata[filled:filled + take, 0] = self._buffer[:take]
-                self._buffer = self._buffer[take:]
-                filled += take
-                continue
-
-            # Try to get more data from queue
-            try:
-                chunk = self._queue.get_nowait()
-                if chunk is None:
-                    # End signal - fill rest with silence and stop
-                    outdata[filled:, 0] = 0
-                    self._finished.set()
-                    return
-                self._buffer = chunk.flatten().astype(np.float32)
-            except queue.Empty:
-                # No data yet - fill with silence (this creates small gaps)
-                outdata[filled:, 0] = 0
-                return
+        lead_in = self._lead_in_added - self._lead_in_played
+        if lead_in > 0:
+            # Lead-in plays at once, ahead of the prebuffer hold
+            filled = self._ring.read_into(outdata[:min(frames, lead_in), 0])
+            self._lead_in_played += filled
+            lead_in -= filled
+
+        if not self._playing and lead_in == 0:
+            # Hold playback until the prebuffer target is reached
+            self._playing = self._eof or self._ring.available >= self._prebuffer_samples
+
+        if self._playing and filled < frames:
+            filled += self._ring.read_into(outdata[filled:, 0])
+        if filled < frames:
+            # Not enough audio yet (or end of stream) - pad with silence
+            outdata[filled:].fill(0)
+            if self._eof and self._ring.available == 0:
+                self._finished.set()
+            elif self._playing:
+                # Ran dry mid-utterance: count each gap once, accumulate its length
+                if not self._in_underrun:
+                    self.underruns += 1
+                    self._in_underrun = True
+                self.underrun_sec += (frames - filled) / self.sample_rate
+        elif self._in_underrun:
+            self._in_underrun = False
+
+        elapsed = perf_counter() - start
+        self.callback_count += 1
+        self.callback_total_sec += elapsed
+        if elapsed > self.callback_max_sec:
+            self.callback_max_sec = elapsed
+
+    def callback_stats(self) -> dict[str, float]:
+        """Audio callback timing against the per-block deadline, in milliseconds."""
+        count = max(self.callback_count, 1)
+        return {
+            "callbacks": self.callback_count,
+            "avg_ms": 1000 * self.callback_total_sec / count,
+            "max_ms": 1000 * self.callback_max_sec,
+            "budget_ms": 1000 * self.blocksize / self.sample_rate,
+        }
 
     def start(self):
         """Start the audio stream."""
         self._finished.clear()
-        self._queue = queue.Queue()
-        self._buffer = np.array([], dtype=np.float32)
+        self._eof = False
+        self._ring.reset()
+        self._reset_stats()
         self._stream = sd.OutputStream(
             samplerate=self.sample_rate,
             channels=1,
@@ -68,26 +131,67 @@ class StreamingAudioPlayer:
         )
         self._stream.start()
 
+    def add_lead_in(self, audio: np.ndarray):
+        """Queue audio that plays immediately, before any add_chunk() audio.
+
+        Lead-in is not held back by the prebuffer and does not count toward
+        the producer timing and utterance length the prebuffer learns from.
+
+        Args:
+            audio: Audio data as numpy array.
+        """
+        if audio is not None and len(audio) > 0:
+            # Count before writing, so the callback never takes it for prebuffered audio
+            self._lead_in_added += len(audio)
+            self._ring.write(audio)
+
     def add_chunk(self, audio: np.ndarray):
-        """Add an audio chunk to the playback queue.
+        """Add an audio chunk to the playback buffer.
+
+        Blocks while the buffer is full.
 
         Args:
             audio: Audio data as numpy array.
         """
         if audio is not None and len(audio) > 0:
-            self._queue.put(audio.flatten().astype(np.float32))
+            now = perf_counter()
+            if self._first_chunk_at is None:
+                self._first_chunk_at = now
+            self._last_chunk_at = now
+            self._samples_added += len(audio)
+            self._ring.write(audio)
 
     def finish(self):
         """Signal that no more chunks will be added and wait for playback to complete."""
-        self._queue.put(None)  # End signal
+        self._eof = True  # End signal
         self._finished.wait()  # Wait for playback to complete
         if self._stream:
             self._stream.stop()
             self._stream.close()
             self._stream = None
+        stats = self.callback_stats()
+        print(
+            f"Playback callback: avg {stats['avg_ms']:.2f} ms, max {stats['max_ms']:.2f} ms "
+            f"(budget {stats['budget_ms']:.1f} ms)",
+            file=sys.stderr
+        )
+        print(
+            f"Playback: prebuffer {self._prebuffer_sec:.2f}s, "
+            f"{self.underruns} underruns ({self.underrun_sec:.2f}s)",
+            file=sys.stderr
+        )
+        if self.prebuffer is not None and self._first_chunk_at is not None:
+            self.prebuffer.observe(
+                audio_sec=self._samples_added / self.sample_rate,
+                producer_sec=self._last_chunk_at - self._first_chunk_at,
+                underruns=self.underruns,
+                underrun_sec=self.underrun_sec,
+                prebuffer_sec=self._prebuffer_sec,
+            )
 
     def stop(self):
         """Stop playback immediately."""
+        self._ring.close()
         if self._stream:
             self._stream.stop()
             self._stream.close()
@@ -30,26 +30,82 @@ VOICES_DIR.mkdir(exist_ok=True)
 
 # PID files for process tracking
 MAIN_PID_FILE = TEMP_DIR / "main.pid"
+DAEMON_PID_FILE = TEMP_DIR / "daemon.pid"
+
+# Control socket of the push-to-talk recorder process
+RECORDER_SOCKET = TEMP_DIR / "recorder.sock"
+
+# Unix socket served by the resident daemon (main.py serve)
+DAEMON_SOCKET = TEMP_DIR / "daemon.sock"
 
 # Audio settings
 SAMPLE_RATE = 16000
 CHANNELS = 1
 
+# Always-on capture in the daemon: keep the microphone open and mark
+# recordings in a ring buffer so the first syllable is never clipped
+ALWAYS_ON_CAPTURE = os.environ.get("VOICE_ALWAYS_ON_CAPTURE", "") == "1"
+CAPTURE_BUFFER_SEC = 120.0  # Longest push-to-talk recording kept
+PREROLL_SEC = 0.3  # Audio kept from before the key press
+
+# Voice activity detection before STT
+VAD_THRESHOLD_DB = -45.0  # Minimum frame level (dBFS) counted as speech
+VAD_PADDING_SEC = 0.2  # Audio kept around detected speech
+
+# Streaming STT while the key is held (needs always-on capture)
+STREAMING_STT = os.environ.get("VOICE_STREAMING_STT", "1") == "1"
+STREAMING_STT_WINDOW_SEC = 8.0  # Decoded window; bounds post-release STT work
+STREAMING_STT_OVERLAP_SEC = 1.0  # Audio shared by consecutive windows
+STREAMING_STT_POLL_SEC = 0.25  # How often new audio is pulled from the ring
+
 # Conversation settings
 SILENCE_THRESHOLD_SEC = 1.5
 IDLE_TIMEOUT_SEC = 10.0
 LLM_TIMEOUT_SEC = 120.0  # Increased for slower cloud models
+SPEECH_QUEUE_SIZE = 4  # Sentences buffered between the LLM stream and TTS
+PLAYBACK_BUFFER_SEC = 5.0  # Audio synthesized ahead of playback when reading text
+PREBUFFER_MIN_SEC = 0.1  # Adaptive playback start delay bounds (see jitter.py)
+PREBUFFER_MAX_SEC = 2.0
+
+# Read Selection: first chunk small for a fast start, later ones larger
+READER_FIRST_CHARS = 80
+READER_MAX_CHARS = 400
 
 # API configuration
 REDPILL_API_KEY = os.environ.get("REDPILL_API_KEY", "")
 REDPILL_BASE_URL = "https://api.redpill.ai/v1"
+HTTP_KEEPALIVE_SEC = 300.0  # Keep idle RedPill connections open between turns
+LLM_PROMPT_CACHE_HINTS = True  # Send prompt_cache_key so providers reuse the cached prefix
 OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_KEEP_ALIVE = "30m"  # Keep local models (and their prompt cache) loaded between turns
+# Which local models the daemon keeps loaded: "current" (active persona's,
+# unloading the previous one on switch), "all" (every persona's) or "none"
+OLLAMA_RESIDENCY = os.environ.get("VOICE_OLLAMA_RESIDENCY", "current")
 
 # Moshi model configuration
 MOSHI_REPO = "kyutai/moshiko-mlx-q8"  # Quantized Moshi model for STT/TTS
 MOSHI_QUANTIZE = 8  # Quantization bits (4 or 8)
 MOSHI_SAMPLE_RATE = 24000  # Audio sample rate
 
+# TTS model (declared here so cache keys can be computed without loading it)
+TTS_REPO = "kyutai/tts-1.6b-en_fr"
+TTS_VOICE_REPO = "kyutai/tts-voices"
+TTS_VOICE = "alba-mackenna/casual.wav"
+TTS_QUANTIZE = 8
+TTS_DECODE_QUEUE_FRAMES = 16  # Frames generation may run ahead of Mimi decoding
+TTS_DECODE_BATCH_FRAMES = 1  # >1 decodes queued frames together when decoding falls behind
+
+# Synthesized speech cache
+TTS_CACHE = os.environ.get("VOICE_TTS_CACHE", "1") == "1"
+TTS_CACHE_DIR = PROJECT_DIR / "cache" / "tts"
+TTS_CACHE_MAX_MB = 200
+
+# Filler clips (personas.yaml "fillers"), rendered by the daemon at start-up
+# and played when the predicted time to first audio exceeds the threshold
+FILLERS = os.environ.get("VOICE_FILLERS", "1") == "1"
+FILLER_THRESHOLD_SEC = 1.5
+LATENCY_EMA_ALPHA = 0.3
+
 # Persona config file
 PERSONAS_FILE = PROJECT_DIR / "personas.yaml"
 
@@ -58,3 +114,22 @@ MODELS_FILE = PROJECT_DIR / "models.yaml"
 
 # Model override file (stores user's current model selection)
 MODEL_OVERRIDE_FILE = TEMP_DIR / "model_override.txt"
+
+# Conversation history (one append-only log per persona, kept across runs)
+HISTORY_DIR = Path(os.environ.get("VOICE_HISTORY_DIR", PROJECT_DIR / "history"))
+PERSIST_HISTORY = os.environ.get("VOICE_PERSIST_HISTORY", "1") == "1"
+HISTORY_LOAD_MESSAGES = 200  # Messages read from the log when a conversation starts
+
+# History token budget: the model's context_length (models.yaml, or the
+# persona's llm config) minus the system prompt and a reply reserve,
+# capped so long sessions do not slow down prompt processing
+DEFAULT_CONTEXT_LENGTH = 8192
+RESPONSE_TOKEN_RESERVE = 1024
+MAX_HISTORY_TOKENS = 6000
+HISTORY_TRIM_TARGET = 0.6  # Fraction of the budget kept when trimming in a block
+
+# LLM response cache for repeated queries in the same context
+# (personas opt out with `response_cache: false` in personas.yaml)
+RESPONSE_CACHE = os.environ.get("VOICE_RESPONSE_CACHE", "1") == "1"
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL_SEC = 600.0
@@ -1,11 +1,32 @@
 """Conversation state machine for managing voice interaction flow."""
 
+import sys
+from collections import deque
 from enum import Enum, auto
-from typing import Any
+from typing import Any, Iterator
 
+import config
 from persona_manager import PersonaManager
 from llm_router import LLMRouter
 from model_manager import ModelManager
+from history_store import HistoryStore
+from response_cache import ResponseCache
+
+
+CHARS_PER_TOKEN = 4  # Rough average for English text with BPE tokenizers
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and separator tokens added per message
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without a model-specific tokenizer.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        Approximate number of tokens.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
 
 
 class State(Enum):
@@ -19,21 +40,39 @@ class State(Enum):
 class Conversation:
     """Manages conversation state and message history."""
 
-    MAX_HISTORY = 10  # Keep last N turn pairs
-
-    def __init__(self, persona_manager: PersonaManager, llm_router: LLMRouter):
+    def __init__(
+        self,
+        persona_manager: PersonaManager,
+        llm_router: LLMRouter,
+        history: HistoryStore | None = None,
+        response_cache: ResponseCache | None = None,
+    ):
         """Initialize conversation.
 
         Args:
             persona_manager: Manager for persona configuration.
             llm_router: Router for LLM requests.
+            history: Persistent log to resume from and append to. In-memory only if None.
+            response_cache: Cache of replies to repeated queries. Disabled if None.
         """
         self.persona_manager = persona_manager
         self.llm_router = llm_router
+        self.history = history
+        self.response_cache = response_cache
         self.state = State.IDLE
         self.messages: list[dict[str, str]] = []
         self.current_transcript = ""
 
+        # Token count of each message in self.messages, computed once on add
+        self._token_counts: deque[int] = deque()
+        self.history_tokens = 0
+        self.token_budget = config.MAX_HISTORY_TOKENS
+
+        if history is not None:
+            for message in history.window(config.HISTORY_LOAD_MESSAGES):
+                self._track(message)
+            self._trim_history()
+
     def toggle(self) -> State:
         """Toggle conversation state.
 
@@ -68,8 +107,7 @@ class Conversation:
         Args:
             content: The user's message text.
         """
-        self.messages.append({"role": "user", "content": content})
-        self._trim_history()
+        self._add_message({"role": "user", "content": content})
 
     def add_assistant_message(self, content: str) -> None:
         """Add assistant message to history.
@@ -77,23 +115,66 @@ class Conversation:
         Args:
             content: The assistant's response text.
         """
-        self.messages.append({"role": "assistant", "content": content})
+        self._add_message({"role": "assistant", "content": content})
+
+    def _add_message(self, message: dict[str, str]) -> None:
+        """Append a message to history and the persistent log."""
+        self._track(message)
+        if self.history is not None:
+            self.history.append(message)
         self._trim_history()
 
+    def _track(self, message: dict[str, str]) -> None:
+        """Add a message and its token count to the running total."""
+        tokens = estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+        self.messages.append(message)
+        self._token_counts.append(tokens)
+        self.history_tokens += tokens
+
     def _trim_history(self) -> None:
-        """Trim message history to MAX_HISTORY turn pairs."""
-        max_messages = self.MAX_HISTORY * 2
-        if len(self.messages) > max_messages:
-            self.messages = self.messages[-max_messages:]
+        """Drop the oldest messages once history exceeds the token budget.
 
-    def get_response(self) -> str:
-        """Get LLM response for current conversation.
+        Trimming goes down to config.HISTORY_TRIM_TARGET of the budget in one
+        block, so the request prefix (system prompt plus older history) then
+        stays unchanged for several turns and provider prompt caches keep
+        hitting. The newest message is always kept, and history never starts
+        with an assistant reply whose question was dropped. The cut is
+        recorded in the persistent log, so conversations resumed from it in
+        later turns start from the same message.
+        """
+        if self.history_tokens <= self.token_budget:
+            return
+        drop = 0
+        target = int(self.token_budget * config.HISTORY_TRIM_TARGET)
+        while len(self.messages) - drop > 1 and self.history_tokens > target:
+            self.history_tokens -= self._token_counts.popleft()
+            drop += 1
+        while drop and len(self.messages) - drop > 1 and self.messages[drop]["role"] == "assistant":
+            self.history_tokens -= self._token_counts.popleft()
+            drop += 1
+        if drop:
+            del self.messages[:drop]
+            if self.history is not None:
+                self.history.mark_window(len(self.messages))
 
-        Uses model override if set, otherwise uses persona's default model.
+    def _update_budget(self, llm_config: dict[str, str], system_prompt: str) -> None:
+        """Size the history budget for the model about to be called.
 
-        Returns:
-            Assistant response text.
+        Args:
+            llm_config: LLM config of the request.
+            system_prompt: System prompt sent with the request.
         """
+        context_length = (
+            ModelManager().get_context_length(llm_config["model"])
+            or llm_config.get("context_length")
+            or config.DEFAULT_CONTEXT_LENGTH
+        )
+        available = context_length - config.RESPONSE_TOKEN_RESERVE - estimate_tokens(system_prompt)
+        self.token_budget = max(0, min(config.MAX_HISTORY_TOKENS, available))
+        self._trim_history()
+
+    def _llm_config(self) -> dict[str, str]:
+        """LLM config for the current persona, with any model override applied."""
         persona = self.persona_manager.get_current()
 
         # Check for model override
@@ -102,6 +183,48 @@ class Conversation:
         override_model = model_manager.get_current_model()
         if override_model:
             llm_config["model"] = override_model
+        return llm_config
+
+    def _cache_key(self, persona: dict[str, Any], llm_config: dict[str, str]) -> str | None:
+        """Response cache key for the pending query, or None if not cacheable."""
+        if self.response_cache is None or not persona.get("response_cache", True):
+            return None
+        if not self.messages or self.messages[-1]["role"] != "user":
+            return None
+        return ResponseCache.make_key(
+            self.persona_manager.current_persona_id,
+            llm_config["model"],
+            self.messages[:-1],
+            self.messages[-1]["content"]
+        )
+
+    def _cached_response(self, key: str | None) -> str | None:
+        """Look up a cached reply and log hits."""
+        if key is None:
+            return None
+        response = self.response_cache.get(key)
+        if response is not None:
+            print("Response cache hit", file=sys.stderr)
+        return response
+
+    def get_response(self) -> str:
+        """Get LLM response for current conversation.
+
+        Uses model override if set, otherwise uses persona's default model.
+        History is first packed into that model's token budget. Repeated
+        queries are answered from the response cache when one is set.
+
+        Returns:
+            Assistant response text.
+        """
+        persona = self.persona_manager.get_current()
+        llm_config = self._llm_config()
+        self._update_budget(llm_config, persona["system_prompt"])
+
+        key = self._cache_key(persona, llm_config)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
 
         response = self.llm_router.chat(
             llm_config=llm_config,
@@ -109,8 +232,46 @@ class Conversation:
             system_prompt=persona["system_prompt"]
         )
 
+        if key is not None:
+            self.response_cache.put(key, response)
         return response
 
+    def stream_response(self) -> Iterator[str]:
+        """Stream LLM response for current conversation.
+
+        Uses model override if set, otherwise uses persona's default model.
+        History is first packed into that model's token budget. Repeated
+        queries are answered from the response cache when one is set.
+        The caller adds the complete reply with add_assistant_message().
+
+        Yields:
+            Response text fragments as they arrive.
+        """
+        persona = self.persona_manager.get_current()
+        llm_config = self._llm_config()
+        self._update_budget(llm_config, persona["system_prompt"])
+
+        key = self._cache_key(persona, llm_config)
+        cached = self._cached_response(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        for token in self.llm_router.chat_stream(
+            llm_config=llm_config,
+            messages=self.messages,
+            system_prompt=persona["system_prompt"]
+        ):
+            parts.append(token)
+            yield token
+
+        # Only complete replies are cached
+        if key is not None:
+            self.response_cache.put(key, "".join(parts))
+
     def clear_history(self) -> None:
         """Clear conversation history."""
         self.messages = []
+        self._token_counts.clear()
+        self.history_tokens = 0
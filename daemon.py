@@ -0,0 +1,328 @@
+"""Resident voice daemon.
+
+Keeps the STT, TTS and LLM objects loaded across hotkey presses and
+serves the CLI commands over a Unix domain socket. The CLI falls back to
+running commands in-process when no daemon is listening.
+"""
+
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+import config
+import ipc
+
+
+class VoiceDaemon:
+    """Serves voice commands from a single resident pipeline."""
+
+    def __init__(self, pipeline=None, socket_path: Path | None = None, recorder=None):
+        """Initialize daemon.
+
+        Args:
+            pipeline: VoicePipeline to serve. Created on start if None.
+            socket_path: Socket to listen on. Defaults to config.DAEMON_SOCKET.
+            recorder: Always-on ContinuousRecorder, or None to leave
+                recording to the recorder.py subprocess.
+        """
+        self.pipeline = pipeline
+        self.socket_path = socket_path or config.DAEMON_SOCKET
+        self.recorder = recorder
+        self._stream = None
+        self._stream_id = 0  # Identifies the latest key press's streaming thread
+        self._stream_lock = threading.Lock()
+        self._session = None
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+        # Models are not thread-safe; serialize all pipeline work
+        self._work_lock = threading.Lock()
+
+    def handle(self, header: dict[str, Any], payload: bytes) -> dict[str, Any]:
+        """Execute one request.
+
+        Args:
+            header: Request header with 'command' and optional 'text'.
+            payload: Optional audio payload.
+
+        Returns:
+            Response dict with 'ok' and optional 'stdout' or 'error'.
+        """
+        command = header.get("command")
+        text = header.get("text") or ""
+
+        if command == "ping":
+            return {"ok": True}
+        if command == "stats":
+            cache = self.pipeline.response_cache
+            return {
+                "ok": True,
+                "response_cache": cache.stats() if cache is not None else None,
+                "playback": list(self.pipeline.prebuffer.history),
+            }
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+
+        # Recording control never waits for pipeline work
+        if command == "start":
+            self.pipeline.warm_llm()
+            if self.recorder is None:
+                return {"ok": True, "recording": False}
+            self.recorder.start()
+            if config.STREAMING_STT:
+                with self._stream_lock:
+                    self._stream_id += 1
+                    stream_id = self._stream_id
+                threading.Thread(target=self._stream_recording, args=(stream_id,), daemon=True).start()
+            return {"ok": True, "recording": True}
+        if command == "converse":
+            return self._start_session()
+        if command == "stop":
+            if self._session is not None:
+                self._session.stop()
+            if self.recorder is not None:
+                self.recorder.stop()
+            stream = self._take_stream()
+            if stream is not None:
+                stream.cancel()
+            return {"ok": True}
+
+        audio = ipc.decode_audio(header, payload)
+        sample_rate = header.get("sample_rate", config.MOSHI_SAMPLE_RATE)
+        transcript = None
+        # Only commands that consume the recording may end it; a persona
+        # switch or speak while the key is held leaves capture running
+        if (
+            audio is None
+            and command in ("stop_and_process", "dictate")
+            and self.recorder is not None
+            and self.recorder.is_recording
+        ):
+            audio = self.recorder.stop()
+            sample_rate = self.recorder.sample_rate
+            # Only the last window is left to decode after release
+            stream = self._take_stream()
+            if stream is not None:
+                try:
+                    transcript = stream.finish(audio)
+                except Exception as e:
+                    print(f"Streaming STT failed, transcribing whole clip: {e}", file=sys.stderr)
+
+        with self._work_lock:
+            if command == "stop_and_process":
+                if audio is None:
+                    return {"ok": False, "error": "No audio recorded"}
+                self.pipeline.respond(audio, sample_rate, transcript=transcript)
+                return {"ok": True}
+            if command == "dictate":
+                if audio is None:
+                    return {"ok": False, "error": "No audio recorded"}
+                return {"ok": True, "stdout": self.pipeline.dictate(audio, sample_rate, transcript=transcript)}
+            if command == "speak":
+                self.pipeline.speak(text)
+                return {"ok": True}
+            if command == "persona":
+                persona = self.pipeline.switch_persona(text)
+                return {"ok": True, "name": persona["name"]}
+
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+    def _take_stream(self):
+        """Detach the current streaming transcriber, if any."""
+        with self._stream_lock:
+            stream, self._stream = self._stream, None
+            self._stream_id += 1  # A thread still starting up must not attach
+            return stream
+
+    def _stream_recording(self, stream_id: int) -> None:
+        """Feed always-on capture into a streaming transcriber while the key is held.
+
+        Args:
+            stream_id: Value of _stream_id when the key was pressed. The
+                stream is discarded if a later press or a release happened
+                while the model was loading.
+        """
+        from stt import StreamingTranscriber
+
+        recorder = self.recorder
+        position = recorder.start_position
+        stream = StreamingTranscriber(
+            self.pipeline.transcriber,
+            sample_rate=recorder.sample_rate,
+            window_sec=config.STREAMING_STT_WINDOW_SEC,
+            overlap_sec=config.STREAMING_STT_OVERLAP_SEC,
+            lock=self._work_lock,
+        )
+        with self._stream_lock:
+            current = stream_id == self._stream_id and recorder.is_recording
+            if current:
+                previous, self._stream = self._stream, stream
+        if not current:
+            # Key released (or pressed again) while the model was loading
+            stream.cancel()
+            return
+        if previous is not None:
+            previous.cancel()
+
+        while recorder.is_recording and self._stream is stream:
+            time.sleep(config.STREAMING_STT_POLL_SEC)
+            audio = recorder.ring.read(position)
+            position += len(audio)
+            stream.feed(audio)
+
+    def _start_session(self) -> dict[str, Any]:
+        """Start hands-free conversation in the background."""
+        if self._session is not None:
+            return {"ok": True, "stdout": "Already listening"}
+
+        from hands_free import HandsFreeSession
+
+        recorder = self.recorder
+        if recorder is None:
+            from audio_capture import ContinuousRecorder
+            recorder = ContinuousRecorder()
+            recorder.open()
+
+        session = HandsFreeSession(self.pipeline, recorder, lock=self._work_lock)
+        self._session = session
+
+        def run():
+            try:
+                session.run()
+            finally:
+                self._session = None
+                if recorder is not self.recorder:
+                    recorder.close()
+
+        threading.Thread(target=run, daemon=True).start()
+        return {"ok": True}
+
+    def _warm(self) -> None:
+        """Load models in the background while already accepting requests."""
+        with self._work_lock:
+            try:
+                self.pipeline.warm()
+            except Exception as e:
+                print(f"Model warm-up failed: {e}", file=sys.stderr)
+
+    def serve_forever(self) -> None:
+        """Bind the socket, warm up models and serve until shut down."""
+        existing = ipc.connect(self.socket_path)
+        if existing is not None:
+            existing.close()
+            print("Daemon already running", file=sys.stderr)
+            return
+
+        # Remove stale socket left behind by a crashed daemon
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        if self.pipeline is None:
+            from pipeline import VoicePipeline
+            self.pipeline = VoicePipeline()
+
+        if self.recorder is not None:
+            self.recorder.open()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                message = ipc.recv_message(self.rfile)
+                if message is None:
+                    return
+                try:
+                    response = daemon.handle(*message)
+                except Exception as e:
+                    print(f"Error: {e}", file=sys.stderr)
+                    response = {"ok": False, "error": str(e)}
+                ipc.send_message(self.connection, response)
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self._server.daemon_threads = True
+        config.DAEMON_PID_FILE.write_text(str(os.getpid()))
+        print(f"Daemon listening on {self.socket_path}", file=sys.stderr)
+
+        threading.Thread(target=self._warm, daemon=True).start()
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.recorder is not None:
+                self.recorder.close()
+            for path in (self.socket_path, config.DAEMON_PID_FILE):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def shutdown(self) -> None:
+        """Stop serving requests."""
+        if self._server:
+            self._server.shutdown()
+
+
+def request(
+    command: str,
+    text: str | None = None,
+    audio: np.ndarray | None = None,
+    sample_rate: int | None = None,
+    socket_path: Path | None = None,
+) -> dict[str, Any] | None:
+    """Send a command to the running daemon.
+
+    Args:
+        command: Command name (same as the CLI command).
+        text: Optional text argument.
+        audio: Optional captured audio.
+        sample_rate: Sample rate of audio.
+        socket_path: Daemon socket. Defaults to config.DAEMON_SOCKET.
+
+    Returns:
+        Response dict, or None if no daemon is running.
+    """
+    sock = ipc.connect(socket_path or config.DAEMON_SOCKET)
+    if sock is None:
+        return None
+
+    header: dict[str, Any] = {"command": command}
+    if text is not None:
+        header["text"] = text
+    payload = b""
+    if audio is not None:
+        fields, payload = ipc.encode_audio(audio, sample_rate or config.MOSHI_SAMPLE_RATE)
+        header.update(fields)
+
+    with sock, sock.makefile("rb") as rfile:
+        ipc.send_message(sock, header, payload)
+        message = ipc.recv_message(rfile)
+
+    if message is None:
+        return {"ok": False, "error": "Daemon closed the connection"}
+    return message[0]
+
+
+def serve() -> None:
+    """Run the daemon in the foreground until SIGINT/SIGTERM."""
+    recorder = None
+    if config.ALWAYS_ON_CAPTURE:
+        from audio_capture import ContinuousRecorder
+        recorder = ContinuousRecorder()
+
+    daemon = VoiceDaemon(recorder=recorder)
+
+    def _stop(signum, frame):
+        threading.Thread(target=daemon.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    daemon.serve_forever()
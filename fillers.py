@@ -0,0 +1,74 @@
+"""Latency-masking filler clips.
+
+Personas can declare short acknowledgement phrases ("fillers" in
+personas.yaml). They are synthesized once and kept in memory, so one can
+start playing the moment a slow reply is predicted, while STT, the LLM and
+TTS are still working on the real answer.
+"""
+
+import random
+
+import numpy as np
+
+import config
+
+
+class LatencyPredictor:
+    """Exponential moving average of time to first audio."""
+
+    def __init__(self, alpha: float | None = None):
+        """Initialize predictor.
+
+        Args:
+            alpha: Weight of each new observation. Defaults to config.LATENCY_EMA_ALPHA.
+        """
+        self.alpha = config.LATENCY_EMA_ALPHA if alpha is None else alpha
+        self.estimate: float | None = None
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a completed turn."""
+        if self.estimate is None:
+            self.estimate = seconds
+        else:
+            self.estimate += self.alpha * (seconds - self.estimate)
+
+
+class FillerBank:
+    """Pre-rendered filler clips per persona."""
+
+    def __init__(self):
+        self._clips: dict[str, list[np.ndarray]] = {}
+        self._last: dict[str, int] = {}
+
+    def render(self, persona_id: str, phrases: list[str], synthesize) -> None:
+        """Synthesize and store a persona's fillers.
+
+        Args:
+            persona_id: Persona the clips belong to.
+            phrases: Filler phrases from personas.yaml.
+            synthesize: Function(text) -> np.ndarray.
+        """
+        clips = [clip for clip in (synthesize(phrase) for phrase in phrases) if len(clip) > 0]
+        if clips:
+            self._clips[persona_id] = clips
+
+    def has(self, persona_id: str) -> bool:
+        """Whether any clips are ready for a persona."""
+        return persona_id in self._clips
+
+    def pick(self, persona_id: str) -> np.ndarray | None:
+        """Choose a clip, avoiding the one played last time.
+
+        Args:
+            persona_id: Active persona.
+
+        Returns:
+            Audio clip, or None if the persona has no fillers.
+        """
+        clips = self._clips.get(persona_id)
+        if not clips:
+            return None
+        choices = [i for i in range(len(clips)) if i != self._last.get(persona_id)] or [0]
+        index = random.choice(choices)
+        self._last[persona_id] = index
+        return clips[index]
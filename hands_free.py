@@ -0,0 +1,100 @@
+"""Hands-free conversation mode.
+
+Listens continuously, ends each turn after config.SILENCE_THRESHOLD_SEC
+of trailing silence, runs it through the pipeline and goes straight back
+to listening. Returns to IDLE after config.IDLE_TIMEOUT_SEC without speech.
+"""
+
+import sys
+import threading
+import time
+
+import config
+from conversation import Conversation, State
+from vad import Endpointer
+
+
+class HandsFreeSession:
+    """Drives a Conversation through IDLE/LISTENING/THINKING/SPEAKING."""
+
+    POLL_SEC = 0.1  # How often new audio is pulled from the ring buffer
+
+    def __init__(
+        self,
+        pipeline,
+        recorder,
+        silence_sec: float | None = None,
+        idle_timeout_sec: float | None = None,
+        lock=None,
+    ):
+        """Initialize session.
+
+        Args:
+            pipeline: VoicePipeline used to run each turn.
+            recorder: Open ContinuousRecorder to listen on.
+            silence_sec: Trailing silence that ends a turn. Defaults to config.SILENCE_THRESHOLD_SEC.
+            idle_timeout_sec: Time without speech before going idle. Defaults to config.IDLE_TIMEOUT_SEC.
+            lock: Optional lock held while a turn runs (shared models).
+        """
+        self.pipeline = pipeline
+        self.recorder = recorder
+        self.idle_timeout_sec = config.IDLE_TIMEOUT_SEC if idle_timeout_sec is None else idle_timeout_sec
+        self.endpointer = Endpointer(recorder.sample_rate, silence_sec=silence_sec)
+        self.conversation = Conversation(
+            pipeline.persona_manager, pipeline.llm_router,
+            pipeline.history_store(), pipeline.response_cache
+        )
+        self._lock = lock or threading.Lock()
+        self._stopped = threading.Event()
+
+    @property
+    def state(self) -> State:
+        """Current conversation state."""
+        return self.conversation.state
+
+    def stop(self) -> None:
+        """Stop listening after the current step."""
+        self._stopped.set()
+
+    def _listen(self, preroll_sec: float | None = None) -> int:
+        """Enter LISTENING and mark a new recording.
+
+        Returns:
+            Ring buffer position to read new audio from.
+        """
+        self.recorder.stop()
+        self.recorder.start(preroll_sec=preroll_sec)
+        self.endpointer.reset()
+        self.conversation.state = State.LISTENING
+        return self.recorder.start_position
+
+    def run(self) -> None:
+        """Listen and run turns until idle timeout or stop()."""
+        self._stopped.clear()
+        position = self._listen()
+        idle_since = time.monotonic()
+        print("Listening (hands-free)...", file=sys.stderr)
+
+        try:
+            while not self._stopped.is_set():
+                time.sleep(self.POLL_SEC)
+                audio = self.recorder.ring.read(position)
+                position += len(audio)
+                event = self.endpointer.process(audio)
+
+                if event == Endpointer.SPEECH_START:
+                    idle_since = None
+                elif event == Endpointer.TURN_END:
+                    turn = self.recorder.stop()
+                    with self._lock:
+                        self.pipeline.respond(turn, self.recorder.sample_rate, conversation=self.conversation)
+                    # Back to listening right after playback, without pre-roll
+                    # so the tail of our own speech is not picked up
+                    position = self._listen(preroll_sec=0)
+                    idle_since = time.monotonic()
+                elif idle_since is not None and time.monotonic() - idle_since > self.idle_timeout_sec:
+                    print("Idle timeout", file=sys.stderr)
+                    break
+        finally:
+            self.recorder.stop()
+            self.conversation.stop()
@@ -0,0 +1,145 @@
+"""Persistent per-persona conversation history.
+
+Each persona has an append-only JSON Lines log. Appends are a single
+O_APPEND write under an exclusive flock, so concurrent processes (CLI and
+daemon) never interleave partial records. Loading reads backwards from the
+end of the file, so the cost depends on how many turns are loaded, not on
+how long the log has grown. When a conversation trims its history, it
+appends a window marker, so the next process resumes from the same first
+message.
+"""
+
+import fcntl
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterator
+
+import config
+
+READ_BLOCK = 8192  # Bytes read per step when scanning back from the end
+
+
+class HistoryStore:
+    """Append-only message log for one persona."""
+
+    def __init__(self, persona_id: str, directory: Path | None = None):
+        """Initialize store.
+
+        Args:
+            persona_id: Persona whose history this is.
+            directory: Directory holding the logs. Defaults to config.HISTORY_DIR.
+        """
+        self.persona_id = persona_id
+        directory = directory or config.HISTORY_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"{persona_id}.jsonl"
+
+    def append(self, *messages: dict[str, str]) -> None:
+        """Append messages as one atomic write.
+
+        Args:
+            messages: Chat messages with role and content.
+        """
+        data = "".join(
+            json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for message in messages
+        ).encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, data)
+        finally:
+            os.close(fd)  # Also releases the lock
+
+    def mark_window(self, kept: int) -> None:
+        """Record that history was trimmed to the last kept messages.
+
+        The marker lets a later process resume with the same first message
+        the trimming conversation kept, so the prompt prefix (and any
+        provider prompt cache) survives across processes and turns.
+
+        Args:
+            kept: Messages before this point that are still in the window.
+        """
+        self.append({"window": kept})
+
+    def _records_from_end(self) -> Iterator[dict[str, Any]]:
+        """Parse records newest first, reading the file backwards in blocks."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            partial = b""
+            while pos > 0:
+                step = min(READ_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + partial).split(b"\n")
+                partial = lines[0]  # May be cut off mid-record
+                for line in reversed(lines[1:]):
+                    yield from self._parse(line)
+            yield from self._parse(partial)
+
+    def _parse(self, line: bytes) -> list[dict[str, Any]]:
+        """Decode one JSON line, skipping blank and torn records."""
+        if not line.strip():
+            return []
+        try:
+            return [json.loads(line)]
+        except ValueError:
+            print(f"Skipping corrupt history line in {self.path.name}", file=sys.stderr)
+            return []
+
+    def tail(self, count: int) -> list[dict[str, str]]:
+        """Load the most recent messages.
+
+        Args:
+            count: Maximum number of messages to return.
+
+        Returns:
+            Up to count messages, oldest first.
+        """
+        messages = []
+        if count > 0:
+            for record in self._records_from_end():
+                if "role" in record:
+                    messages.append(record)
+                    if len(messages) == count:
+                        break
+        return messages[::-1]
+
+    def window(self, count: int) -> list[dict[str, str]]:
+        """Load the messages since the last trim point.
+
+        Args:
+            count: Maximum number of messages to return.
+
+        Returns:
+            Messages from the first one kept by the latest mark_window()
+            call (or the last count messages if there is none), oldest first.
+        """
+        messages = []
+        remaining = None  # Messages still wanted from before the marker
+        for record in self._records_from_end():
+            if len(messages) == count or remaining == 0:
+                break
+            if "role" not in record:
+                if remaining is None:
+                    remaining = record.get("window", 0)
+                continue
+            messages.append(record)
+            if remaining is not None:
+                remaining -= 1
+        return messages[::-1]
+
+    def clear(self) -> None:
+        """Delete this persona's history."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -40,6 +40,11 @@ end
 local PYTHON = findPython()
 local MAIN_SCRIPT = findMainScript()
 
+-- Resident daemon keeps models loaded between hotkey presses
+-- (exits immediately if one is already running)
+voiceDaemon = hs.task.new(PYTHON, nil, {MAIN_SCRIPT, "serve"})
+voiceDaemon:start()
+
 -- Run Python command
 local function runCommand(args)
     local task = hs.task.new(PYTHON, function(exitCode, stdOut, stdErr)
@@ -80,7 +85,8 @@ end
 local pushToDictate = hs.hotkey.new({"cmd", "shift"}, "D",
     function()
         hs.alert.show("📝 Dictating...", 1)
-        runCommand({MAIN_SCRIPT, "start"})
+        -- Dictation only feeds Whisper, so capture at its 16kHz rate
+        runCommand({MAIN_SCRIPT, "start", "--sample-rate", "16000"})
     end,
     function()
         hs.alert.show("⌨️ Typing...", 1)
@@ -102,6 +108,12 @@ local pushToTalk = hs.hotkey.new({"cmd", "shift"}, "T",
 )
 pushToTalk:enable()
 
+-- Hands-free conversation: Cmd+Shift+C (ends turns on silence, stops when idle)
+hs.hotkey.bind({"cmd", "shift"}, "C", function()
+    hs.alert.show("🎙 Hands-free...", 1)
+    runCommand({MAIN_SCRIPT, "converse"})
+end)
+
 -- Stop: Cmd+Shift+X
 hs.hotkey.bind({"cmd", "shift"}, "X", function()
     hs.alert.show("⏹ Stopped", 1)
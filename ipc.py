@@ -0,0 +1,85 @@
+"""Unix domain socket helpers for talking to long-lived voice processes.
+
+A message is one JSON header line, optionally followed by a raw binary
+payload whose length is given by the header's ``payload_bytes`` field.
+Audio travels as little-endian float32 samples with its ``sample_rate``
+in the header.
+"""
+
+import json
+import socket
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+
+
+def connect(path: Path, timeout: float | None = 1.0) -> socket.socket | None:
+    """Connect to a Unix socket.
+
+    Args:
+        path: Socket file path.
+        timeout: Connect timeout in seconds.
+
+    Returns:
+        Connected socket (blocking, no timeout), or None if nothing is listening.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except (FileNotFoundError, ConnectionRefusedError, socket.timeout, OSError):
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def send_message(sock: socket.socket, header: dict[str, Any], payload: bytes = b"") -> None:
+    """Send a header line and optional binary payload."""
+    header = dict(header, payload_bytes=len(payload))
+    sock.sendall(json.dumps(header).encode() + b"\n" + payload)
+
+
+def recv_message(rfile: BinaryIO) -> tuple[dict[str, Any], bytes] | None:
+    """Read one message from a socket file.
+
+    Returns:
+        (header, payload) tuple, or None if the peer closed the connection.
+    """
+    line = rfile.readline()
+    if not line:
+        return None
+    header = json.loads(line)
+    size = header.pop("payload_bytes", 0)
+    payload = rfile.read(size) if size else b""
+    if len(payload) != size:
+        return None
+    return header, payload
+
+
+def encode_audio(audio: np.ndarray, sample_rate: int) -> tuple[dict[str, Any], bytes]:
+    """Encode audio as header fields and a float32 payload."""
+    audio = np.ascontiguousarray(audio, dtype="<f4").reshape(-1)
+    return {"sample_rate": sample_rate}, audio.tobytes()
+
+
+def send_audio(
+    sock: socket.socket,
+    header: dict[str, Any],
+    chunks: list[np.ndarray],
+    sample_rate: int,
+) -> None:
+    """Stream audio chunks as one message without concatenating them first."""
+    total = sum(chunk.size for chunk in chunks) * 4
+    header = dict(header, sample_rate=sample_rate, payload_bytes=total)
+    sock.sendall(json.dumps(header).encode() + b"\n")
+    for chunk in chunks:
+        sock.sendall(np.ascontiguousarray(chunk, dtype="<f4").reshape(-1).data)
+
+
+def decode_audio(header: dict[str, Any], payload: bytes) -> np.ndarray | None:
+    """Decode a float32 audio payload, or None if the message has no audio."""
+    if "sample_rate" not in header:
+        return None
+    return np.frombuffer(payload, dtype="<f4")
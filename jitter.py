@@ -0,0 +1,84 @@
+"""Adaptive playback prebuffering.
+
+When TTS produces audio slower than real time, playing the first chunk
+immediately means the player runs dry mid-utterance. If the producer needs
+rtf seconds per second of audio, an utterance of D seconds plays without
+gaps only when playback starts D * (rtf - 1) seconds late. The prebuffer
+learns rtf and D from past utterances and adds a safety margin that grows
+after underruns and shrinks while playback stays smooth.
+"""
+
+from collections import deque
+from typing import Any
+
+import config
+
+HISTORY_SIZE = 50  # Utterance records kept for inspection
+
+
+class AdaptivePrebuffer:
+    """Chooses how much audio to buffer before playback starts."""
+
+    def __init__(
+        self,
+        min_sec: float | None = None,
+        max_sec: float | None = None,
+        alpha: float = 0.3,
+    ):
+        """Initialize prebuffer.
+
+        Args:
+            min_sec: Smallest prebuffer. Defaults to config.PREBUFFER_MIN_SEC.
+            max_sec: Largest prebuffer. Defaults to config.PREBUFFER_MAX_SEC.
+            alpha: Weight of each utterance in the moving averages.
+        """
+        self.min_sec = config.PREBUFFER_MIN_SEC if min_sec is None else min_sec
+        self.max_sec = config.PREBUFFER_MAX_SEC if max_sec is None else max_sec
+        self.alpha = alpha
+        self.rtf: float | None = None  # Producer seconds per second of audio
+        self.duration: float | None = None  # Typical utterance length
+        self.margin = self.min_sec
+        self.history: deque[dict[str, Any]] = deque(maxlen=HISTORY_SIZE)
+
+    def target_sec(self) -> float:
+        """Audio to buffer before starting playback."""
+        lead = 0.0
+        if self.rtf is not None and self.duration is not None:
+            lead = self.duration * max(0.0, self.rtf - 1.0)
+        return min(self.max_sec, max(self.min_sec, lead + self.margin))
+
+    def observe(
+        self,
+        audio_sec: float,
+        producer_sec: float,
+        underruns: int,
+        underrun_sec: float,
+        prebuffer_sec: float,
+    ) -> None:
+        """Record a finished utterance and adapt.
+
+        Args:
+            audio_sec: Audio produced.
+            producer_sec: Wall time from the first to the last chunk.
+            underruns: Times playback ran dry mid-utterance.
+            underrun_sec: Total silence inserted by underruns.
+            prebuffer_sec: Prebuffer target used for this utterance.
+        """
+        if audio_sec <= 0:
+            return
+        rtf = producer_sec / audio_sec
+        self.rtf = rtf if self.rtf is None else self.rtf + self.alpha * (rtf - self.rtf)
+        self.duration = audio_sec if self.duration is None else self.duration + self.alpha * (audio_sec - self.duration)
+
+        if underruns:
+            self.margin = min(self.max_sec, self.margin + underrun_sec)
+        else:
+            self.margin = max(self.min_sec, self.margin * 0.9)
+
+        self.history.append({
+            "audio_sec": round(audio_sec, 3),
+            "rtf": round(rtf, 3),
+            "prebuffer_sec": round(prebuffer_sec, 3),
+            "underruns": underruns,
+            "underrun_sec": round(underrun_sec, 3),
+        })
@@ -1,12 +1,30 @@
 """LLM router for directing requests to Ollama or RedPill."""
 
-from typing import Any
+import hashlib
+import importlib.util
+import json
+import sys
+import threading
+import time
+from typing import Any, Iterator
 
 import httpx
 import ollama
 
 import config
 
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def ollama_keep_alive() -> str | int:
+    """keep_alive for Ollama requests under config.OLLAMA_RESIDENCY.
+
+    Ollama applies the keep_alive of every request, so chat requests must
+    send -1 too when every model is pinned, or the first turn unpins it.
+    """
+    return -1 if config.OLLAMA_RESIDENCY == "all" else config.OLLAMA_KEEP_ALIVE
+
 
 class LLMRouter:
     """Routes LLM requests to appropriate provider."""
@@ -17,6 +35,170 @@ class LLMRouter:
         self.redpill_base_url = config.REDPILL_BASE_URL
         self.ollama_host = config.OLLAMA_HOST
         self.timeout = config.LLM_TIMEOUT_SEC
+        self.last_ttft: float | None = None  # Time to first token of last stream
+        self.last_usage: dict[str, int] = {}  # Prompt cache stats of last request
+        self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        """Pooled keep-alive HTTP client for RedPill, created on first use."""
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=4,
+                        keepalive_expiry=config.HTTP_KEEPALIVE_SEC
+                    )
+                )
+            return self._client
+
+    def _redpill_headers(self) -> dict[str, str]:
+        """Request headers for RedPill API."""
+        return {
+            "Authorization": f"Bearer {self.redpill_api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def prewarm(self, provider: str) -> threading.Thread | None:
+        """Open the provider connection in the background.
+
+        Called when recording starts, so DNS, TCP and TLS setup overlap
+        with the user speaking instead of following it.
+
+        Args:
+            provider: Provider the next request will go to.
+
+        Returns:
+            The warm-up thread, or None if the provider needs no connection.
+        """
+        if provider != "redpill":
+            return None
+
+        def warm():
+            try:
+                self.client.get(f"{self.redpill_base_url}/models", headers=self._redpill_headers())
+            except httpx.HTTPError:
+                pass  # Only the connection matters
+
+        thread = threading.Thread(target=warm, daemon=True)
+        thread.start()
+        return thread
+
+    def preload(self, llm_config: dict[str, str], keep_alive: str | int | None = None) -> threading.Thread | None:
+        """Load a local model in the background so the next request skips the load.
+
+        Args:
+            llm_config: Dict with 'provider' and 'model' keys.
+            keep_alive: How long Ollama keeps the model loaded (-1 pins it).
+                Defaults to ollama_keep_alive().
+
+        Returns:
+            The loading thread, or None if the provider has nothing to load.
+        """
+        if llm_config.get("provider") != "ollama":
+            return None
+        model = llm_config["model"]
+        options = self._ollama_options(llm_config)
+        keep_alive = ollama_keep_alive() if keep_alive is None else keep_alive
+
+        def load():
+            start = time.perf_counter()
+            try:
+                # An empty prompt loads the model without generating. The
+                # context size must match chat requests, or Ollama reloads it
+                ollama.generate(model=model, prompt="", options=options, keep_alive=keep_alive)
+                print(f"Loaded {model} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+            except Exception as e:
+                print(f"Could not preload {model}: {e}", file=sys.stderr)
+
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self, llm_config: dict[str, str]) -> threading.Thread | None:
+        """Ask Ollama to free a local model's memory, in the background.
+
+        Args:
+            llm_config: Dict with 'provider' and 'model' keys.
+
+        Returns:
+            The unloading thread, or None if the provider has nothing to unload.
+        """
+        if llm_config.get("provider") != "ollama":
+            return None
+        model = llm_config["model"]
+
+        def unload():
+            try:
+                ollama.generate(model=model, prompt="", keep_alive=0)
+            except Exception as e:
+                print(f"Could not unload {model}: {e}", file=sys.stderr)
+
+        thread = threading.Thread(target=unload, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    @staticmethod
+    def _full_messages(messages: list[dict[str, str]], system_prompt: str) -> list[dict[str, str]]:
+        """Build the request messages with the system prompt first.
+
+        The system prompt and older history form a prefix that stays
+        byte-identical across turns, so provider prompt caches can reuse it.
+        """
+        return [{"role": "system", "content": system_prompt}, *messages]
+
+    @staticmethod
+    def _cache_key(model: str, system_prompt: str) -> str:
+        """Stable key routing requests with the same prefix to the same cache."""
+        return hashlib.sha256(f"{model}\n{system_prompt}".encode()).hexdigest()[:32]
+
+    def _redpill_body(self, model: str, messages: list[dict[str, str]], system_prompt: str) -> dict[str, Any]:
+        """Request body for RedPill chat completions."""
+        body: dict[str, Any] = {
+            "model": model,
+            "messages": self._full_messages(messages, system_prompt)
+        }
+        if config.LLM_PROMPT_CACHE_HINTS:
+            body["prompt_cache_key"] = self._cache_key(model, system_prompt)
+        return body
+
+    def _record_usage(self, prompt_tokens: int | None, cached_tokens: int | None) -> None:
+        """Store and log prompt cache statistics for the last request."""
+        if prompt_tokens is None:
+            return
+        self.last_usage = {"prompt_tokens": prompt_tokens, "cached_tokens": cached_tokens or 0}
+        print(
+            f"LLM prompt: {prompt_tokens} tokens, {cached_tokens or 0} cached",
+            file=sys.stderr
+        )
+
+    def _record_openai_usage(self, usage: dict[str, Any] | None) -> None:
+        """Record stats from an OpenAI-style usage object."""
+        if not usage:
+            return
+        details = usage.get("prompt_tokens_details") or {}
+        self._record_usage(usage.get("prompt_tokens"), details.get("cached_tokens"))
+
+    def _record_ollama_usage(self, response) -> None:
+        """Record stats from a final Ollama response.
+
+        Ollama reuses the KV cache of a loaded model for a matching prefix, and
+        prompt_eval_count only counts the tokens it had to evaluate.
+        """
+        evaluated = response.get("prompt_eval_count")
+        if evaluated is not None:
+            self.last_usage = {"prompt_eval_count": evaluated}
+            print(f"LLM prompt: {evaluated} tokens evaluated", file=sys.stderr)
 
     def chat(
         self,
@@ -41,25 +223,78 @@ class LLMRouter:
         model = llm_config["model"]
 
         if provider == "ollama":
-            return self._chat_ollama(model, messages, system_prompt)
+            return self._chat_ollama(model, messages, system_prompt, self._ollama_options(llm_config))
         elif provider == "redpill":
             return self._chat_redpill(model, messages, system_prompt)
         else:
             raise ValueError(f"Unknown LLM provider: {provider}")
 
+    def chat_stream(
+        self,
+        llm_config: dict[str, str],
+        messages: list[dict[str, str]],
+        system_prompt: str
+    ) -> Iterator[str]:
+        """Stream a chat response token by token.
+
+        Records time to first token in last_ttft.
+
+        Args:
+            llm_config: Dict with 'provider' and 'model' keys.
+            messages: List of message dicts with 'role' and 'content'.
+            system_prompt: System prompt for the conversation.
+
+        Yields:
+            Response text fragments as they arrive.
+
+        Raises:
+            ValueError: If provider is unknown.
+        """
+        provider = llm_config["provider"]
+        model = llm_config["model"]
+
+        if provider == "ollama":
+            tokens = self._stream_ollama(model, messages, system_prompt, self._ollama_options(llm_config))
+        elif provider == "redpill":
+            tokens = self._stream_redpill(model, messages, system_prompt)
+        else:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+
+        start = time.perf_counter()
+        self.last_ttft = None
+        for token in tokens:
+            if self.last_ttft is None:
+                self.last_ttft = time.perf_counter() - start
+                print(f"LLM time to first token: {self.last_ttft:.2f}s", file=sys.stderr)
+            yield token
+
+    @staticmethod
+    def _ollama_options(llm_config: dict[str, str]) -> dict[str, int] | None:
+        """Model options for Ollama requests.
+
+        Ollama runs models with its own default context (2048 or 4096
+        tokens) and drops the oldest prompt tokens, system prompt included,
+        when a request is longer. The persona's declared context_length is
+        sent as num_ctx, so the history budget packed for it actually fits.
+        """
+        context_length = llm_config.get("context_length")
+        return {"num_ctx": int(context_length)} if context_length else None
+
     def _chat_ollama(
         self,
         model: str,
         messages: list[dict[str, str]],
-        system_prompt: str
+        system_prompt: str,
+        options: dict[str, int] | None = None
     ) -> str:
         """Send request to local Ollama instance."""
-        full_messages = [{"role": "system", "content": system_prompt}] + messages
-
         response = ollama.chat(
             model=model,
-            messages=full_messages
+            messages=self._full_messages(messages, system_prompt),
+            options=options,
+            keep_alive=ollama_keep_alive()
         )
+        self._record_ollama_usage(response)
 
         return response["message"]["content"]
 
@@ -70,20 +305,65 @@ class LLMRouter:
         system_prompt: str
     ) -> str:
         """Send request to RedPill API."""
-        full_messages = [{"role": "system", "content": system_prompt}] + messages
-
-        response = httpx.post(
+        response = self.client.post(
             f"{self.redpill_base_url}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {self.redpill_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": model,
-                "messages": full_messages
-            },
-            timeout=self.timeout
+            headers=self._redpill_headers(),
+            json=self._redpill_body(model, messages, system_prompt)
         )
         response.raise_for_status()
 
-        return response.json()["choices"][0]["message"]["content"]
+        data = response.json()
+        self._record_openai_usage(data.get("usage"))
+        return data["choices"][0]["message"]["content"]
+
+    def _stream_ollama(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        system_prompt: str,
+        options: dict[str, int] | None = None
+    ) -> Iterator[str]:
+        """Stream response chunks from local Ollama instance."""
+        for chunk in ollama.chat(
+            model=model,
+            messages=self._full_messages(messages, system_prompt),
+            stream=True,
+            options=options,
+            keep_alive=ollama_keep_alive()
+        ):
+            content = chunk["message"]["content"]
+            if content:
+                yield content
+            if chunk.get("done"):
+                self._record_ollama_usage(chunk)
+
+    def _stream_redpill(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        system_prompt: str
+    ) -> Iterator[str]:
+        """Stream response from RedPill API via server-sent events."""
+        body = self._redpill_body(model, messages, system_prompt)
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}  # Final event carries usage
+
+        with self.client.stream(
+            "POST",
+            f"{self.redpill_base_url}/chat/completions",
+            headers={**self._redpill_headers(), "Accept": "text/event-stream"},
+            json=body
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                self._record_openai_usage(event.get("usage"))
+                choices = event.get("choices") or [{}]
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Main entry point for voice-realtime conversation system.
 
-Uses file-based communication for push-to-talk since each command
-is a separate process invocation from Hammerspoon.
+Each command is a separate process invocation from Hammerspoon. The
+push-to-talk recorder runs as a background process controlled over a
+Unix socket, which also carries the captured audio back in memory. When a resident
+daemon (`main.py serve`) is running, commands are forwarded to it so
+models stay loaded; otherwise they run in-process.
 """
 
 import os
@@ -21,17 +24,14 @@ for p in homebrew_paths:
         os.environ["PATH"] = p + ":" + current_path
         current_path = os.environ["PATH"]
 
-import sounddevice as sd
-
 import config
+import ipc
 from persona_manager import PersonaManager
-from llm_router import LLMRouter
-from conversation import Conversation
 
 # File paths for IPC
 RECORDING_PID_FILE = config.TEMP_DIR / "recording.pid"
-RECORDING_STOP_FILE = config.TEMP_DIR / "recording.stop"
-AUDIO_FILE = config.TEMP_DIR / "recording.npy"
+RECORDER_SOCKET = config.RECORDER_SOCKET
+RECORDER_CONNECT_TIMEOUT_SEC = 3.0  # Recorder may still be starting up
 SCRIPT_DIR = config.PROJECT_DIR
 
 
@@ -44,6 +44,15 @@ def read_pid(path):
         return None
 
 
+def process_alive(pid):
+    """Check whether a process exists."""
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
 def remove_file(path):
     """Remove file if exists."""
     try:
@@ -52,117 +61,140 @@ def remove_file(path):
         pass
 
 
-def handle_start():
-    """Handle start command - begin recording in background."""
+def handle_start(sample_rate: int | None = None):
+    """Handle start command - begin recording in background.
+
+    Args:
+        sample_rate: Capture rate for the recorder process. Dictation
+            passes 16000 to capture at Whisper's rate and skip resampling.
+    """
+    # Daemon with always-on capture just marks its ring buffer
+    response = forward_to_daemon("start")
+    if response is not None and response.get("recording"):
+        print("Recording started (daemon)", file=sys.stderr)
+        return
+
     # Check if already recording
     pid = read_pid(RECORDING_PID_FILE)
-    if pid:
-        try:
-            os.kill(pid, 0)  # Check if process exists
-            print("Already recording", file=sys.stderr)
-            return
-        except OSError:
-            pass  # Process doesn't exist, continue
+    if pid and process_alive(pid):
+        print("Already recording", file=sys.stderr)
+        return
 
     # Start recorder subprocess
     recorder_script = SCRIPT_DIR / "recorder.py"
+    args = [sys.executable, str(recorder_script)]
+    if sample_rate:
+        args += ["--sample-rate", str(sample_rate)]
     proc = subprocess.Popen(
-        [sys.executable, str(recorder_script)],
+        args,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
         start_new_session=True
     )
+    # Record PID now so an immediate stop can find the recorder
+    RECORDING_PID_FILE.write_text(str(proc.pid))
     print(f"Recording started (pid={proc.pid})", file=sys.stderr)
 
 
-def handle_stop_and_process():
-    """Handle stop_and_process command - stop recording and get response."""
-    # Signal recorder to stop by creating stop file
+def connect_recorder(pid: int):
+    """Connect to the recorder's control socket.
+
+    Retries briefly while the recorder process is alive but has not
+    bound its socket yet (key released right after it was pressed).
+    """
+    deadline = time.monotonic() + RECORDER_CONNECT_TIMEOUT_SEC
+    while True:
+        sock = ipc.connect(RECORDER_SOCKET)
+        if sock is not None:
+            return sock
+        if not process_alive(pid) or time.monotonic() > deadline:
+            return None
+        time.sleep(0.01)
+
+
+def stop_recorder(command: str = "stop") -> tuple[np.ndarray, int] | None:
+    """Signal the recorder and receive the captured audio in memory.
+
+    Args:
+        command: "stop" to collect audio, "cancel" to discard it.
+
+    Returns:
+        (audio, sample_rate) tuple, or None if nothing was recorded.
+    """
     pid = read_pid(RECORDING_PID_FILE)
-    if pid:
-        # Create stop file to signal recorder
-        RECORDING_STOP_FILE.touch()
-        # Wait for recorder to finish saving
-        for _ in range(50):  # 5 seconds max
-            time.sleep(0.1)
-            if not RECORDING_PID_FILE.exists():
-                break
-
-    # Check for audio file
-    if not AUDIO_FILE.exists():
-        print("No audio recorded", file=sys.stderr)
-        return
+    sock = connect_recorder(pid) if pid else None
+    if sock is None:
+        remove_file(RECORDING_PID_FILE)
+        return None
 
-    # Load audio
-    audio = np.load(AUDIO_FILE)
-    remove_file(AUDIO_FILE)
+    with sock, sock.makefile("rb") as rfile:
+        ipc.send_message(sock, {"command": command})
+        message = ipc.recv_message(rfile)
 
-    duration = len(audio) / 24000
-    print(f"Captured {duration:.1f}s of audio", file=sys.stderr)
+    audio = ipc.decode_audio(*message) if message else None
+    if audio is None:
+        return None
+    return audio, message[0]["sample_rate"]
 
-    if len(audio) < 4800:  # Less than 0.2 seconds
-        print("Audio too short", file=sys.stderr)
-        return
 
-    # Load models (cached after first load)
-    print("Loading models...", file=sys.stderr)
-    from stt import WhisperTranscriber
-    from tts import MoshiSynthesizer
+def forward_to_daemon(
+    command: str,
+    text: str | None = None,
+    audio: np.ndarray | None = None,
+    sample_rate: int | None = None,
+) -> dict | None:
+    """Run command on the resident daemon if one is running.
+
+    Prints the daemon's stdout output and exits on daemon-side errors.
 
-    transcriber = WhisperTranscriber(model="distil-medium.en")  # Fast & accurate for English
-    synthesizer = MoshiSynthesizer()
+    Returns:
+        Daemon response, or None if no daemon is running.
+    """
+    import daemon
+    response = daemon.request(command, text=text, audio=audio, sample_rate=sample_rate)
+    if response is None:
+        return None
+
+    if response.get("stdout"):
+        print(response["stdout"])
+    if not response.get("ok"):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        sys.exit(1)
+    return response
 
-    # Transcribe
-    print("Transcribing...", file=sys.stderr)
-    transcript = transcriber.transcribe(audio)
 
-    if not transcript.strip():
-        print("No speech detected", file=sys.stderr)
+def handle_stop_and_process():
+    """Handle stop_and_process command - stop recording and get response."""
+    # Daemon uses its own capture when no recorder process was running
+    audio, sample_rate = stop_recorder() or (None, None)
+    if forward_to_daemon("stop_and_process", audio=audio, sample_rate=sample_rate) is not None:
         return
 
-    print(f"You said: {transcript}", file=sys.stderr)
+    if audio is None:
+        print("No audio recorded", file=sys.stderr)
+        return
 
-    # Get LLM response
-    print("Getting response...", file=sys.stderr)
-    persona_manager = PersonaManager()
-    llm_router = LLMRouter()
-    conversation = Conversation(persona_manager, llm_router)
-
-    conversation.add_user_message(transcript)
-    response = conversation.get_response()
-    conversation.add_assistant_message(response)
-    print(f"AI: {response}", file=sys.stderr)
-
-    # Synthesize and play with streaming (starts speaking immediately)
-    print("Speaking...", file=sys.stderr)
-    from audio_playback import StreamingAudioPlayer
-    player = StreamingAudioPlayer(sample_rate=24000)
-    player.start()
-    synthesizer.synthesize_streaming(response, player.add_chunk)
-    player.finish()
+    from pipeline import VoicePipeline
+    VoicePipeline().respond(audio, sample_rate)
 
     print("Done", file=sys.stderr)
 
 
 def handle_stop():
     """Handle stop command - cancel recording."""
-    pid = read_pid(RECORDING_PID_FILE)
-    if pid:
-        # Create stop file to signal recorder
-        RECORDING_STOP_FILE.touch()
-        # Wait briefly for it to stop
-        for _ in range(20):
-            time.sleep(0.1)
-            if not RECORDING_PID_FILE.exists():
-                break
+    forward_to_daemon("stop")
+    stop_recorder("cancel")
     remove_file(RECORDING_PID_FILE)
-    remove_file(RECORDING_STOP_FILE)
-    remove_file(AUDIO_FILE)
     print("Stopped", file=sys.stderr)
 
 
 def handle_persona(persona_id: str):
     """Handle persona switch command."""
+    response = forward_to_daemon("persona", text=persona_id)
+    if response is not None:
+        print(f"Switched to: {response['name']}", file=sys.stderr)
+        return
+
     persona_manager = PersonaManager()
     try:
         persona = persona_manager.switch(persona_id)
@@ -174,45 +206,21 @@ def handle_persona(persona_id: str):
 
 def handle_dictate():
     """Handle dictate command - transcribe and output text to stdout for typing."""
-    # Signal recorder to stop by creating stop file
-    pid = read_pid(RECORDING_PID_FILE)
-    if pid:
-        RECORDING_STOP_FILE.touch()
-        for _ in range(50):  # 5 seconds max
-            time.sleep(0.1)
-            if not RECORDING_PID_FILE.exists():
-                break
-
-    # Check for audio file
-    if not AUDIO_FILE.exists():
-        print("No audio recorded", file=sys.stderr)
+    # Daemon uses its own capture when no recorder process was running
+    audio, sample_rate = stop_recorder() or (None, None)
+    if forward_to_daemon("dictate", audio=audio, sample_rate=sample_rate) is not None:
         return
 
-    # Load audio
-    audio = np.load(AUDIO_FILE)
-    remove_file(AUDIO_FILE)
-
-    duration = len(audio) / 24000
-    print(f"Captured {duration:.1f}s of audio", file=sys.stderr)
-
-    if len(audio) < 4800:  # Less than 0.2 seconds
-        print("Audio too short", file=sys.stderr)
+    if audio is None:
+        print("No audio recorded", file=sys.stderr)
         return
 
-    # Load transcriber
-    print("Transcribing...", file=sys.stderr)
-    from stt import WhisperTranscriber
-    transcriber = WhisperTranscriber(model="distil-medium.en")
-
-    # Transcribe
-    transcript = transcriber.transcribe(audio)
-
-    if not transcript.strip():
-        print("No speech detected", file=sys.stderr)
-        return
+    from pipeline import VoicePipeline
+    transcript = VoicePipeline().dictate(audio, sample_rate)
 
     # Output transcript to stdout (for Hammerspoon to capture and type)
-    print(transcript)
+    if transcript:
+        print(transcript)
 
 
 def handle_speak(text: str):
@@ -223,20 +231,55 @@ def handle_speak(text: str):
 
     print(f"Speaking: {text[:50]}{'...' if len(text) > 50 else ''}", file=sys.stderr)
 
-    # Load TTS
-    from tts import MoshiSynthesizer
-    from audio_playback import StreamingAudioPlayer
-    synthesizer = MoshiSynthesizer()
+    if forward_to_daemon("speak", text=text) is not None:
+        return
 
-    # Synthesize and play with streaming
-    player = StreamingAudioPlayer(sample_rate=24000)
-    player.start()
-    synthesizer.synthesize_streaming(text, player.add_chunk)
-    player.finish()
+    from pipeline import VoicePipeline
+    VoicePipeline().speak(text)
 
     print("Done", file=sys.stderr)
 
 
+def handle_converse():
+    """Handle converse command - hands-free multi-turn conversation."""
+    if forward_to_daemon("converse") is not None:
+        print("Hands-free mode started (daemon)", file=sys.stderr)
+        return
+
+    from audio_capture import ContinuousRecorder
+    from hands_free import HandsFreeSession
+    from pipeline import VoicePipeline
+
+    recorder = ContinuousRecorder()
+    recorder.open()
+    try:
+        HandsFreeSession(VoicePipeline(), recorder).run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+
+
+def handle_serve():
+    """Handle serve command - run the resident voice daemon."""
+    import daemon
+    daemon.serve()
+
+
+def handle_stats():
+    """Handle stats command - print the daemon's cache and playback stats as JSON."""
+    import json
+
+    response = forward_to_daemon("stats")
+    if response is None:
+        # Stats are kept in the daemon's memory; in-process runs have none
+        print("Daemon not running", file=sys.stderr)
+        sys.exit(1)
+
+    response.pop("ok", None)
+    print(json.dumps(response, indent=2))
+
+
 def handle_model(model_id: str | None):
     """Handle model command - list or set model."""
     from model_manager import ModelManager
@@ -286,14 +329,15 @@ def handle_model_json():
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Voice Realtime Conversation")
-    parser.add_argument("command", choices=["start", "stop_and_process", "stop", "persona", "dictate", "speak", "model", "model_json"],
+    parser.add_argument("command", choices=["start", "stop_and_process", "stop", "persona", "dictate", "speak", "model", "model_json", "serve", "converse", "stats"],
                         help="Command to execute")
     parser.add_argument("text", nargs="?", help="Text for speak command, persona ID for persona command, or model ID for model command")
+    parser.add_argument("--sample-rate", type=int, help="Capture sample rate for start command (16000 for dictation)")
 
     args = parser.parse_args()
 
     if args.command == "start":
-        handle_start()
+        handle_start(args.sample_rate)
     elif args.command == "stop_and_process":
         handle_stop_and_process()
     elif args.command == "stop":
@@ -315,6 +359,12 @@ def main():
         handle_model(args.text)
     elif args.command == "model_json":
         handle_model_json()
+    elif args.command == "serve":
+        handle_serve()
+    elif args.command == "converse":
+        handle_converse()
+    elif args.command == "stats":
+        handle_stats()
 
 
 if __name__ == "__main__":
@@ -66,6 +66,11 @@ class ModelManager:
         """Get model info by ID."""
         return self.models.get(model_id)
 
+    def get_context_length(self, model_id: str) -> int | None:
+        """Get a model's declared context window in tokens, if known."""
+        model = self.models.get(model_id)
+        return model.get("context_length") if model else None
+
     def list_models(self) -> list[dict[str, Any]]:
         """List all available models.
 
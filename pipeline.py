@@ -0,0 +1,400 @@
+"""Voice pipeline shared by the CLI commands and the resident daemon.
+
+Owns the STT, TTS and LLM objects. Models are loaded lazily on first use
+and reused for every later call, so a long-lived process only pays the
+load cost once.
+"""
+
+import sys
+import threading
+import time
+from typing import Iterable
+
+import numpy as np
+
+import config
+import vad
+from text_segmenter import chunk_long_text
+from synthesis_session import SynthesisSession
+from persona_manager import PersonaManager
+from llm_router import LLMRouter
+from conversation import Conversation, State
+from history_store import HistoryStore
+from response_cache import ResponseCache
+from tts_cache import TTSCache
+from fillers import FillerBank, LatencyPredictor
+from jitter import AdaptivePrebuffer
+
+
+class VoicePipeline:
+    """Runs dictation, conversation turns and speech with resident models."""
+
+    STT_MODEL = "distil-medium.en"  # Fast & accurate for English
+    MIN_AUDIO_SEC = 0.2
+
+    def __init__(self):
+        """Initialize pipeline. Models load on first use."""
+        self.persona_manager = PersonaManager()
+        self.llm_router = LLMRouter()
+        self.response_cache = ResponseCache() if config.RESPONSE_CACHE else None
+        self.tts_cache = TTSCache() if config.TTS_CACHE else None
+        self.fillers = FillerBank()
+        self.latency = LatencyPredictor()  # Time from the start of a turn to first audio
+        self.prebuffer = AdaptivePrebuffer()  # Learns playback start delay across utterances
+        self._transcriber = None
+        self._synthesizer = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def transcriber(self):
+        """Whisper transcriber, loaded on first access."""
+        with self._load_lock:
+            if self._transcriber is None:
+                from stt import WhisperTranscriber
+                self._transcriber = WhisperTranscriber(model=self.STT_MODEL)
+                self._transcriber._load_model()
+            return self._transcriber
+
+    @property
+    def synthesizer(self):
+        """Moshi synthesizer, loaded on first access."""
+        with self._load_lock:
+            if self._synthesizer is None:
+                from tts import MoshiSynthesizer
+                self._synthesizer = MoshiSynthesizer(
+                    hf_repo=config.TTS_REPO,
+                    voice_repo=config.TTS_VOICE_REPO,
+                    voice=config.TTS_VOICE,
+                    quantize=config.TTS_QUANTIZE,
+                    decode_queue_size=config.TTS_DECODE_QUEUE_FRAMES,
+                    decode_batch_frames=config.TTS_DECODE_BATCH_FRAMES,
+                )
+            return self._synthesizer
+
+    def warm(self) -> None:
+        """Load STT, TTS and local LLM models ahead of the first request."""
+        print("Loading models...", file=sys.stderr)
+        self.preload_llm()
+        self.transcriber
+        self.synthesizer
+        if config.FILLERS:
+            self.render_fillers()
+        print("Models ready", file=sys.stderr)
+
+    def render_fillers(self) -> None:
+        """Synthesize every persona's filler phrases."""
+        for persona_id, persona in self.persona_manager.personas.items():
+            phrases = persona.get("fillers") or []
+            if phrases:
+                self.fillers.render(persona_id, phrases, self._render)
+
+    def _pick_filler(self) -> np.ndarray | None:
+        """Filler clip to play if the reply is predicted to be slow."""
+        if self.latency.estimate is None or self.latency.estimate < config.FILLER_THRESHOLD_SEC:
+            return None
+        return self.fillers.pick(self.persona_manager.current_persona_id)
+
+    def preload_llm(self, previous: dict | None = None) -> None:
+        """Apply config.OLLAMA_RESIDENCY to local LLM models.
+
+        "current" keeps the active persona's model loaded and unloads the
+        previous persona's model; "all" pins every persona's model; "none"
+        leaves loading to the first request.
+
+        Args:
+            previous: Persona that was active before a switch, if any.
+        """
+        policy = config.OLLAMA_RESIDENCY
+        if policy == "all":
+            for persona_id in self.persona_manager.list_personas():
+                self.llm_router.preload(self.persona_manager.personas[persona_id]["llm"], keep_alive=-1)
+        elif policy == "current":
+            current = self.persona_manager.get_current()["llm"]
+            if previous is not None and previous["llm"] != current:
+                self.llm_router.unload(previous["llm"])
+            self.llm_router.preload(current)
+
+    def warm_llm(self) -> None:
+        """Get the current persona's LLM ready while the user is speaking.
+
+        Opens the RedPill connection, and unless config.OLLAMA_RESIDENCY is
+        "none", (re)loads a local model in case its keep-alive has expired.
+        """
+        llm_config = self.persona_manager.get_current()["llm"]
+        self.llm_router.prewarm(llm_config.get("provider", "ollama"))
+        if config.OLLAMA_RESIDENCY != "none":
+            self.llm_router.preload(llm_config)
+
+    def history_store(self) -> HistoryStore | None:
+        """Persistent history for the current persona, or None if disabled."""
+        if not config.PERSIST_HISTORY:
+            return None
+        return HistoryStore(self.persona_manager.current_persona_id)
+
+    def _check_audio(self, audio: np.ndarray, sample_rate: int) -> bool:
+        """Log captured duration and reject clips that are too short."""
+        duration = len(audio) / sample_rate
+        print(f"Captured {duration:.1f}s of audio", file=sys.stderr)
+
+        if duration < self.MIN_AUDIO_SEC:
+            print("Audio too short", file=sys.stderr)
+            return False
+        return True
+
+    def _find_speech(self, audio: np.ndarray, sample_rate: int) -> np.ndarray | None:
+        """Trim silence, returning None if the clip contains no speech."""
+        # Runs before the model is touched; silent clips never load it
+        speech = vad.trim_silence(audio, sample_rate)
+        if len(speech) == 0:
+            print("No speech detected", file=sys.stderr)
+            return None
+        if len(speech) < len(audio):
+            print(f"Trimmed {(len(audio) - len(speech)) / sample_rate:.1f}s of silence", file=sys.stderr)
+        return speech
+
+    def _transcribe(self, speech: np.ndarray, sample_rate: int, transcript: str | None = None) -> str:
+        """Transcribe trimmed speech, returning an empty string if nothing was said.
+
+        Args:
+            speech: Audio from _find_speech().
+            sample_rate: Sample rate of the audio.
+            transcript: Transcript already produced while recording, if any.
+                Only called once the clip passed the silence check, since
+                Whisper hallucinates text for silence and noise.
+        """
+        if transcript is None:
+            print("Transcribing...", file=sys.stderr)
+            transcript = self.transcriber.transcribe(speech, sample_rate=sample_rate)
+
+        if not transcript.strip():
+            print("No speech detected", file=sys.stderr)
+            return ""
+        return transcript
+
+    def dictate(self, audio: np.ndarray, sample_rate: int, transcript: str | None = None) -> str:
+        """Transcribe audio for typing at the cursor.
+
+        Args:
+            audio: Captured audio.
+            sample_rate: Sample rate of the captured audio.
+            transcript: Transcript already produced while recording, if any.
+
+        Returns:
+            Transcript text, or empty string if nothing usable was captured.
+        """
+        if not self._check_audio(audio, sample_rate):
+            return ""
+        speech = self._find_speech(audio, sample_rate)
+        if speech is None:
+            return ""
+        return self._transcribe(speech, sample_rate, transcript)
+
+    def respond(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        transcript: str | None = None,
+        conversation: Conversation | None = None,
+    ) -> str:
+        """Run one conversation turn: transcribe, get a reply and speak it.
+
+        Playback starts before transcription, so a filler clip (when the
+        reply is predicted to be slow) covers both the STT and the LLM wait.
+
+        Args:
+            audio: Captured audio.
+            sample_rate: Sample rate of the captured audio.
+            transcript: Transcript already produced while recording, if any.
+            conversation: Conversation to continue. If None, one is resumed from
+                the current persona's saved history.
+
+        Returns:
+            Assistant response text, or empty string if the turn was skipped.
+        """
+        start = time.perf_counter()
+        if not self._check_audio(audio, sample_rate):
+            return ""
+        speech = self._find_speech(audio, sample_rate)
+        if speech is None:
+            return ""
+
+        # Connection setup overlaps transcription if the pool has gone cold
+        self.warm_llm()
+
+        if conversation is None:
+            conversation = Conversation(
+                self.persona_manager, self.llm_router, self.history_store(), self.response_cache
+            )
+        conversation.state = State.THINKING
+
+        player = self._open_player()
+        try:
+            filler = self._pick_filler()
+            if filler is not None:
+                player.add_lead_in(filler)
+            transcript = self._transcribe(speech, sample_rate, transcript)
+        except BaseException:
+            player.stop()
+            raise
+        if not transcript:
+            player.stop()  # Nothing to acknowledge; cut any filler short
+            return ""
+
+        print(f"You said: {transcript}", file=sys.stderr)
+
+        # Stream the LLM reply into TTS sentence by sentence, so speech
+        # starts as soon as the first sentence is complete
+        print("Getting response...", file=sys.stderr)
+        conversation.add_user_message(transcript)
+        conversation.state = State.SPEAKING
+        response = self.speak_stream(conversation.stream_response(), player=player, start=start)
+        conversation.add_assistant_message(response)
+        print(f"AI: {response}", file=sys.stderr)
+        return response
+
+    def _open_player(self):
+        """Start a streaming player at the TTS sample rate."""
+        from audio_playback import StreamingAudioPlayer
+
+        player = StreamingAudioPlayer(sample_rate=config.MOSHI_SAMPLE_RATE, prebuffer=self.prebuffer)
+        player.start()
+        return player
+
+    def speak(self, text: str) -> None:
+        """Synthesize text and play it as it is generated.
+
+        Long text (e.g. Read Selection) is split by chunk_long_text(): a
+        short first chunk for a fast start, then larger ones. The player's
+        queue is bounded, so synthesis stays only a few seconds ahead of
+        playback and memory does not grow with the document.
+
+        Args:
+            text: Text to speak.
+        """
+        if not text.strip():
+            print("No text to speak", file=sys.stderr)
+            return
+
+        from audio_playback import StreamingAudioPlayer
+
+        player = StreamingAudioPlayer(
+            sample_rate=config.MOSHI_SAMPLE_RATE,
+            buffer_sec=config.PLAYBACK_BUFFER_SEC,
+            prebuffer=self.prebuffer,
+        )
+        player.start()
+        try:
+            for chunk in chunk_long_text(
+                text,
+                first_chars=config.READER_FIRST_CHARS,
+                max_chars=config.READER_MAX_CHARS,
+            ):
+                self._synthesize(chunk, player.add_chunk)
+        finally:
+            player.finish()
+
+    def _synthesize(self, text: str, on_audio, store: bool = True) -> None:
+        """Synthesize text through the TTS cache.
+
+        A hit plays the stored audio without touching (or loading) the TTS
+        model. A miss synthesizes as usual and, if store is set, writes the
+        result in the background.
+
+        Args:
+            text: Text to speak.
+            on_audio: Callback receiving each audio chunk.
+            store: Cache the audio on a miss. One-off text (LLM reply
+                sentences) is not worth the disk write.
+        """
+        if self.tts_cache is None:
+            self.synthesizer.synthesize_streaming(text, on_audio)
+            return
+
+        key = TTSCache.key(text, config.TTS_VOICE, config.TTS_REPO, config.TTS_QUANTIZE)
+        audio = self.tts_cache.get(key)
+        if audio is not None:
+            on_audio(audio)
+            return
+
+        chunks = []
+
+        def collect(chunk):
+            chunks.append(chunk)
+            on_audio(chunk)
+
+        self.synthesizer.synthesize_streaming(text, collect)
+        if store:
+            self.tts_cache.put_async(key, chunks)
+
+    def _render(self, text: str) -> np.ndarray:
+        """Synthesize text to a single clip."""
+        chunks = []
+        self._synthesize(text, chunks.append)
+        return np.concatenate(chunks) if chunks else np.array([], dtype=np.float32)
+
+    def speak_stream(
+        self,
+        tokens: Iterable[str],
+        player=None,
+        start: float | None = None,
+    ) -> str:
+        """Speak streamed text, synthesizing each sentence as soon as it is complete.
+
+        Tokens are pushed into a SynthesisSession, whose worker synthesizes
+        (through the TTS cache) while this thread keeps reading the stream.
+        The session's queue is bounded, so the stream is only read a few
+        sentences ahead of speech.
+
+        Args:
+            tokens: Streamed text fragments (e.g. LLM output).
+            player: Started StreamingAudioPlayer to play into (e.g. one already
+                playing a filler). Finished when speech ends. Opened if None.
+            start: perf_counter() time the user started waiting, for the
+                time-to-first-audio measurement. Defaults to now.
+
+        Returns:
+            The full text that was spoken.
+        """
+        if player is None:
+            player = self._open_player()
+        if start is None:
+            start = time.perf_counter()
+        first_audio: list[float] = []
+
+        def on_audio(chunk):
+            if not first_audio:
+                first_audio.append(time.perf_counter() - start)
+                print(f"Time to first audio: {first_audio[0]:.2f}s", file=sys.stderr)
+                self.latency.observe(first_audio[0])
+            player.add_chunk(chunk)
+
+        session = SynthesisSession(
+            lambda text, on_chunk: self._synthesize(text, on_chunk, store=False),
+            on_audio,
+            max_queue=config.SPEECH_QUEUE_SIZE,
+        )
+        try:
+            try:
+                for token in tokens:
+                    session.push(token)
+            except BaseException:
+                session.close(flush=False, raise_error=False)
+                raise
+            session.close()
+        finally:
+            player.finish()
+        return session.text
+
+    def switch_persona(self, persona_id: str) -> dict:
+        """Switch the active persona.
+
+        Loads the new persona's local LLM model and frees the previous one in
+        the background, so the switch returns without waiting on Ollama.
+
+        Raises:
+            ValueError: If persona_id is not found.
+        """
+        previous = self.persona_manager.get_current()
+        persona = self.persona_manager.switch(persona_id)
+        self.preload_llm(previous)
+        return persona
@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
 """Background audio recorder for push-to-talk.
 
-This script runs as a separate process, recording audio until
-a stop file is created, then saves the audio.
+This script runs as a separate process, recording audio until a
+controller connects to its Unix socket. A "stop" request streams the
+captured audio back over the same connection; "cancel" discards it.
 """
 
+import argparse
 import os
+import socket
 import sys
-import time
-import numpy as np
-import sounddevice as sd
 
 # Add project to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -17,11 +17,10 @@ import config
 
 # File paths
 PID_FILE = config.TEMP_DIR / "recording.pid"
-STOP_FILE = config.TEMP_DIR / "recording.stop"
-AUDIO_FILE = config.TEMP_DIR / "recording.npy"
+SOCKET_FILE = config.RECORDER_SOCKET
 
 # Audio settings
-SAMPLE_RATE = 24000
+SAMPLE_RATE = 24000  # Moshi rate; pass --sample-rate 16000 for STT-only capture
 CHANNELS = 1
 
 # Global state
@@ -33,47 +32,73 @@ def audio_callback(indata, frames, time_info, status):
     chunks.append(indata.copy().flatten())
 
 
+def bind_control_socket() -> socket.socket:
+    """Bind the control socket before opening the audio stream."""
+    try:
+        SOCKET_FILE.unlink()
+    except FileNotFoundError:
+        pass
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(SOCKET_FILE))
+    server.listen(1)
+    return server
+
+
 def main():
-    global chunks
+    parser = argparse.ArgumentParser(description="Push-to-talk recorder")
+    parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE)
+    sample_rate = parser.parse_args().sample_rate
 
-    # Clean up any stale files
-    if STOP_FILE.exists():
-        STOP_FILE.unlink()
+    # Bind first so a stop request sent while the stream opens is not lost
+    server = bind_control_socket()
 
     # Write PID file
     with open(PID_FILE, 'w') as f:
         f.write(str(os.getpid()))
 
+    import numpy as np
+    import sounddevice as sd
+    import ipc
+
+    conn = None
+    command = "cancel"
     try:
         # Start recording
         with sd.InputStream(
-            samplerate=SAMPLE_RATE,
+            samplerate=sample_rate,
             channels=CHANNELS,
             dtype=np.float32,
             callback=audio_callback
         ):
-            # Poll for stop signal
-            while not STOP_FILE.exists():
-                time.sleep(0.05)
+            # Block until a controller connects
+            conn, _ = server.accept()
+            with conn.makefile("rb") as rfile:
+                message = ipc.recv_message(rfile)
+            if message is not None:
+                command = message[0].get("command", "stop")
 
     except Exception as e:
         print(f"Recording error: {e}", file=sys.stderr)
 
     finally:
-        # Save audio
-        if chunks:
-            audio = np.concatenate(chunks)
-            np.save(AUDIO_FILE, audio)
+        # Hand audio to the controller in memory
+        if conn is not None:
+            try:
+                if command == "stop" and chunks:
+                    ipc.send_audio(conn, {"ok": True}, chunks, sample_rate)
+                else:
+                    ipc.send_message(conn, {"ok": True})
+            except OSError:
+                pass
+            conn.close()
 
         # Clean up
-        try:
-            PID_FILE.unlink()
-        except:
-            pass
-        try:
-            STOP_FILE.unlink()
-        except:
-            pass
+        server.close()
+        for path in (PID_FILE, SOCKET_FILE):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
 
 
 if __name__ == "__main__":
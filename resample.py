@@ -0,0 +1,124 @@
+"""Rational polyphase resampling.
+
+Replaces FFT resampling of whole clips with a windowed-sinc polyphase
+filter whose cost grows linearly with the input. The resampler keeps its
+filter history between calls, so audio can be converted chunk by chunk
+as it is captured (e.g. 24 kHz microphone audio to 16 kHz for Whisper).
+"""
+
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+
+TAPS_PER_PHASE = 24  # Filter taps applied per output sample
+KAISER_BETA = 8.0
+
+
+@lru_cache(maxsize=None)
+def polyphase_taps(up: int, down: int, taps_per_phase: int = TAPS_PER_PHASE) -> np.ndarray:
+    """Design a low-pass filter and split it into polyphase components.
+
+    Cached per ratio, so the taps are only computed once per process.
+
+    Args:
+        up: Upsampling factor.
+        down: Downsampling factor.
+        taps_per_phase: Taps in each polyphase branch.
+
+    Returns:
+        Array of shape (up, taps_per_phase); row p holds taps h[p::up].
+    """
+    length = taps_per_phase * up
+    cutoff = 0.9 / (2 * max(up, down))  # Just below the lower Nyquist rate
+    n = np.arange(length) - (length - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, KAISER_BETA)
+    taps *= up / taps.sum()  # Unity passband gain after zero-stuffing
+    phases = taps.reshape(taps_per_phase, up).T.astype(np.float32)
+    phases.flags.writeable = False
+    return phases
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler."""
+
+    def __init__(self, orig_rate: int, target_rate: int):
+        """Initialize resampler.
+
+        Args:
+            orig_rate: Input sample rate.
+            target_rate: Output sample rate.
+        """
+        g = gcd(orig_rate, target_rate)
+        self.up = target_rate // g
+        self.down = orig_rate // g
+        self._phases = polyphase_taps(self.up, self.down)
+        taps = self._phases.shape[1]
+        self._reversed = np.ascontiguousarray(self._phases[:, ::-1])
+        self._history = np.zeros(taps - 1, dtype=np.float32)
+        self._consumed = 0  # Input samples seen so far
+        self._produced = 0  # Output samples emitted so far
+
+    @property
+    def delay(self) -> float:
+        """Filter group delay in output samples."""
+        return (self._phases.size - 1) / 2 / self.down
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Resample the next chunk of input.
+
+        Args:
+            audio: Mono input samples.
+
+        Returns:
+            Output samples that can be computed from the input seen so far.
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if self.up == self.down:
+            return audio
+
+        total = self._consumed + len(audio)
+        n_out = (total * self.up + self.down - 1) // self.down
+        if n_out <= self._produced:
+            self._consumed = total
+            self._history = np.concatenate((self._history, audio))[-len(self._history):]
+            return np.array([], dtype=np.float32)
+
+        # x[i] holds input sample (i + first) where first is the oldest history sample
+        x = np.concatenate((self._history, audio))
+        first = self._consumed - len(self._history)
+        taps = self._phases.shape[1]
+        windows = np.lib.stride_tricks.sliding_window_view(x, taps)
+
+        # Outputs m = q*up + r share one polyphase branch and step through the
+        # input by `down`, so each branch is a single strided matrix-vector product
+        out = np.empty(n_out - self._produced, dtype=np.float32)
+        for r in range(self.up):
+            m0 = self._produced + (r - self._produced) % self.up
+            if m0 >= n_out:
+                continue
+            start = (m0 * self.down) // self.up - first - (taps - 1)
+            count = len(range(m0, n_out, self.up))
+            branch = self._reversed[(m0 * self.down) % self.up]
+            out[m0 - self._produced::self.up] = windows[start::self.down][:count] @ branch
+
+        self._consumed = total
+        self._produced = n_out
+        self._history = x[-len(self._history):]
+        return out
+
+
+def resample(audio: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """Resample a complete clip.
+
+    Args:
+        audio: Mono input samples.
+        orig_rate: Input sample rate.
+        target_rate: Output sample rate.
+
+    Returns:
+        Resampled audio.
+    """
+    if orig_rate == target_rate:
+        return np.asarray(audio, dtype=np.float32).reshape(-1)
+    return PolyphaseResampler(orig_rate, target_rate).process(audio)
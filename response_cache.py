@@ -0,0 +1,117 @@
+"""Exact-match cache for LLM responses.
+
+Repeated questions in the same context (same persona, model and history)
+are answered from memory instead of another LLM round trip. Entries expire
+after a TTL and the least recently used entry is evicted when full.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import config
+
+
+def normalize_transcript(text: str) -> str:
+    """Normalize a transcript so trivial differences still hit the cache.
+
+    Args:
+        text: Transcribed user query.
+
+    Returns:
+        Lowercased text without punctuation and with collapsed whitespace.
+    """
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+
+class ResponseCache:
+    """TTL + LRU cache of assistant responses."""
+
+    def __init__(self, max_entries: int | None = None, ttl_sec: float | None = None):
+        """Initialize cache.
+
+        Args:
+            max_entries: Entries kept before evicting. Defaults to config.RESPONSE_CACHE_SIZE.
+            ttl_sec: Entry lifetime. Defaults to config.RESPONSE_CACHE_TTL_SEC.
+        """
+        self.max_entries = config.RESPONSE_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl_sec = config.RESPONSE_CACHE_TTL_SEC if ttl_sec is None else ttl_sec
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        persona_id: str,
+        model: str,
+        history: list[dict[str, str]],
+        transcript: str,
+    ) -> str:
+        """Build a cache key.
+
+        Args:
+            persona_id: Active persona.
+            model: Model the request goes to.
+            history: Packed history sent before the query.
+            transcript: User query.
+
+        Returns:
+            Hex digest identifying the request.
+        """
+        history_digest = hashlib.sha256(
+            json.dumps(history, separators=(",", ":"), ensure_ascii=False).encode()
+        ).hexdigest()
+        parts = [persona_id, model, history_digest, normalize_transcript(transcript)]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Look up a response.
+
+        Args:
+            key: Key from make_key().
+
+        Returns:
+            Cached response, or None on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_sec:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response.
+
+        Args:
+            key: Key from make_key().
+            response: Complete assistant response.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,157 @@
+"""Fixed-size preallocated audio ring buffers."""
+
+import threading
+import time
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Ring buffer addressed by absolute sample position.
+
+    Writes never allocate: samples are copied into a preallocated float32
+    array, overwriting the oldest data once full. Positions count every
+    sample ever written, so readers can mark a position and read
+    everything after it later, as long as it has not been overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        """Initialize buffer.
+
+        Args:
+            capacity: Number of samples retained.
+        """
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._written = 0
+        self._lock = threading.Lock()
+
+    @property
+    def position(self) -> int:
+        """Absolute position of the next sample to be written."""
+        return self._written
+
+    @property
+    def oldest(self) -> int:
+        """Absolute position of the oldest retained sample."""
+        return max(0, self._written - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, overwriting the oldest data if full.
+
+        Args:
+            samples: Mono audio samples.
+        """
+        samples = samples.reshape(-1)
+        n = len(samples)
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            skipped = n - self.capacity
+        else:
+            skipped = 0
+
+        with self._lock:
+            start = (self._written + skipped) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            np.copyto(self._data[start:start + first], samples[:first])
+            if first < len(samples):
+                np.copyto(self._data[:len(samples) - first], samples[first:])
+            self._written += n
+
+    def read(self, start: int, end: int | None = None) -> np.ndarray:
+        """Copy samples between two absolute positions.
+
+        Args:
+            start: First position, clamped to the oldest retained sample.
+            end: End position (exclusive). Defaults to the write position.
+
+        Returns:
+            Audio samples as a new float32 array.
+        """
+        with self._lock:
+            end = self._written if end is None else min(end, self._written)
+            start = max(start, self.oldest)
+            if start >= end:
+                return np.array([], dtype=np.float32)
+
+            i = start % self.capacity
+            j = i + (end - start)
+            if j <= self.capacity:
+                return self._data[i:j].copy()
+            return np.concatenate((self._data[i:], self._data[:j - self.capacity]))
+
+
+class PlaybackRingBuffer:
+    """Single-producer, single-consumer ring buffer for audio output.
+
+    The consumer (the real-time audio callback) only copies into the
+    output buffer it is given and takes no locks. Each side advances its
+    own position after copying, so the other side never sees partial data.
+    The producer waits while the buffer is full.
+    """
+
+    WAIT_SEC = 0.005  # Producer poll interval while the buffer is full
+
+    def __init__(self, capacity: int):
+        """Initialize buffer.
+
+        Args:
+            capacity: Maximum samples buffered.
+        """
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        """Empty the buffer."""
+        self._read = 0
+        self._write = 0
+        self.closed = False
+
+    @property
+    def available(self) -> int:
+        """Samples ready to be read."""
+        return self._write - self._read
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, waiting for space while the buffer is full.
+
+        Args:
+            samples: Mono audio samples.
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        offset = 0
+        while offset < len(samples) and not self.closed:
+            space = self.capacity - (self._write - self._read)
+            if space == 0:
+                time.sleep(self.WAIT_SEC)
+                continue
+            n = min(space, len(samples) - offset)
+            start = self._write % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = samples[offset:offset + first]
+            self._data[:n - first] = samples[offset + first:offset + n]
+            self._write += n  # Publish only after the copy
+            offset += n
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Copy buffered samples into out without allocating.
+
+        Args:
+            out: Destination view (e.g. a column of the callback's outdata).
+
+        Returns:
+            Number of samples copied; the rest of out is untouched.
+        """
+        n = min(len(out), self._write - self._read)
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        np.copyto(out[:first], self._data[start:start + first])
+        if n > first:
+            np.copyto(out[first:n], self._data[:n - first])
+        self._read += n
+        return n
+
+    def close(self) -> None:
+        """Stop waiting writers; later writes are dropped."""
+        self.closed = True
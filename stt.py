@@ -1,14 +1,20 @@
 """Speech-to-text module using lightning-whisper-mlx.
 
 Uses the lightning-fast Whisper implementation optimized for Apple Silicon.
+Audio is handed to the model as a float32 array; no temporary WAV file
+is written. StreamingTranscriber decodes overlapping windows while
+recording is still in progress.
 """
 
-import tempfile
+import queue
+import threading
 import numpy as np
-import scipy.io.wavfile as wav
 
 from lightning_whisper_mlx import LightningWhisperMLX
 
+import vad
+from resample import PolyphaseResampler, resample
+
 
 class WhisperTranscriber:
     """Transcribes audio to text using Lightning Whisper MLX."""
@@ -59,44 +65,203 @@ class WhisperTranscriber:
 
         self._load_model()
 
-        # Ensure audio is float32
-        audio = audio.astype(np.float32)
-
-        # Flatten if needed
-        if audio.ndim > 1:
-            audio = audio.flatten()
+        # Float32 mono view of the input; no copy if it already is one
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        owned = False
 
         # Resample to 16kHz if needed (Whisper expects 16kHz)
         if sample_rate != self.SAMPLE_RATE:
-            from scipy import signal
-            num_samples = int(len(audio) * self.SAMPLE_RATE / sample_rate)
-            audio = signal.resample(audio, num_samples)
-
-        # Normalize audio to [-1, 1] range
-        max_val = np.abs(audio).max()
-        if max_val > 0:
-            audio = audio / max_val
-
-        # Convert to int16 for WAV file
-        audio_int16 = (audio * 32767).astype(np.int16)
-
-        # Write to temp WAV file (lightning-whisper-mlx needs a file path)
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = f.name
-            wav.write(temp_path, self.SAMPLE_RATE, audio_int16)
-
-        try:
-            # Transcribe
-            result = self._model.transcribe(temp_path)
-            return result.get("text", "").strip()
-        finally:
-            # Clean up temp file
-            import os
-            try:
-                os.unlink(temp_path)
-            except OSError:
-                pass
+            audio = resample(audio, sample_rate, self.SAMPLE_RATE)
+            owned = True
+
+        # Normalize audio to [-1, 1] range, in place when the buffer is ours
+        peak = max(float(audio.max()), -float(audio.min()))
+        if peak > 0:
+            if owned:
+                audio *= 1.0 / peak
+            else:
+                audio = audio * (1.0 / peak)
+
+        # The model computes log-mel features straight from the array
+        result = self._model.transcribe(audio)
+        return result.get("text", "").strip()
 
 
 # Alias for backwards compatibility
 MoshiTranscriber = WhisperTranscriber
+
+
+def _normalize_word(word: str) -> str:
+    """Lowercase a word and strip punctuation for overlap matching."""
+    return "".join(c for c in word.lower() if c.isalnum())
+
+
+def merge_overlap(committed: list[str], new: list[str], max_overlap: int = 8) -> list[str]:
+    """Append new words, dropping those repeated from an overlapping window.
+
+    Args:
+        committed: Words already committed.
+        new: Words decoded from a window that overlaps the committed audio.
+        max_overlap: Longest repeated run to look for.
+
+    Returns:
+        Combined word list.
+    """
+    tail = [_normalize_word(w) for w in committed[-max_overlap:]]
+    head = [_normalize_word(w) for w in new[:max_overlap]]
+    for k in range(min(len(tail), len(head)), 0, -1):
+        if tail[-k:] == head[:k]:
+            return committed + new[k:]
+    return committed + new
+
+
+class StreamingTranscriber:
+    """Transcribes audio incrementally while it is still being recorded.
+
+    Audio is resampled to 16kHz chunk by chunk as it is fed and split into
+    overlapping windows. Each window is decoded on a background thread as
+    soon as it is complete and its text is committed, so on finish() only
+    the audio after the last complete window is left to decode, however
+    long the utterance was. Windows without speech are skipped, so Whisper
+    never hallucinates text for a silent stretch (e.g. a key held after
+    the user stopped talking).
+    """
+
+    def __init__(
+        self,
+        transcriber: WhisperTranscriber,
+        sample_rate: int = 24000,
+        window_sec: float = 8.0,
+        overlap_sec: float = 1.0,
+        lock=None,
+    ):
+        """Initialize streaming transcriber.
+
+        Args:
+            transcriber: Loaded transcriber used for each window.
+            sample_rate: Sample rate of the fed audio.
+            window_sec: Length of each decoded window.
+            overlap_sec: Audio shared by consecutive windows.
+            lock: Optional lock held around each decode (shared model use).
+        """
+        self.transcriber = transcriber
+        self.sample_rate = sample_rate
+        rate = WhisperTranscriber.SAMPLE_RATE
+        self.window = int(window_sec * rate)
+        self.step = self.window - int(overlap_sec * rate)
+        self._resampler = PolyphaseResampler(sample_rate, rate)
+        self._model_lock = lock or threading.Lock()
+        self._lock = threading.Lock()
+        self._chunks: list[np.ndarray] = []
+        self._fed = 0  # Input samples at sample_rate
+        self._total = 0  # Stored samples at 16kHz
+        self._next_start = 0
+        self._words: list[str] = []
+        self._finished = False
+        self._error: BaseException | None = None
+        self._jobs: queue.Queue[tuple[np.ndarray, bool] | None] = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    @property
+    def samples_fed(self) -> int:
+        """Number of input samples fed so far."""
+        return self._fed
+
+    @property
+    def committed_text(self) -> str:
+        """Text committed from completed windows."""
+        return " ".join(self._words)
+
+    def _audio(self) -> np.ndarray:
+        """All fed audio as one array."""
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0] if self._chunks else np.array([], dtype=np.float32)
+
+    def _run(self) -> None:
+        """Decode queued windows in order."""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if self._error is not None:
+                continue  # Drain without decoding after a failure
+            audio, overlapped = job
+            speech = vad.trim_silence(audio, WhisperTranscriber.SAMPLE_RATE)
+            if len(speech) == 0:
+                continue
+            try:
+                with self._model_lock:
+                    text = self.transcriber.transcribe(speech, sample_rate=WhisperTranscriber.SAMPLE_RATE)
+            except Exception as e:
+                self._error = e
+                continue
+            words = text.split()
+            self._words = merge_overlap(self._words, words) if overlapped else self._words + words
+
+    def _append(self, audio: np.ndarray) -> None:
+        """Resample and store audio, then queue every window it completes."""
+        self._fed += len(audio)
+        audio = self._resampler.process(audio)
+        self._chunks.append(audio)
+        self._total += len(audio)
+
+        while self._total >= self._next_start + self.window:
+            start = self._next_start
+            self._jobs.put((self._audio()[start:start + self.window], start > 0))
+            self._next_start += self.step
+
+    def feed(self, audio: np.ndarray) -> None:
+        """Add captured audio and queue any windows that are now complete.
+
+        Args:
+            audio: Next chunk of captured audio.
+        """
+        with self._lock:
+            if self._finished or len(audio) == 0:
+                return
+            self._append(audio)
+
+    def finish(self, audio: np.ndarray | None = None) -> str:
+        """Decode the remaining tail and return the full transcript.
+
+        Args:
+            audio: Optional complete recording. Any part of it beyond what
+                was already fed is added before finishing.
+
+        Returns:
+            Transcribed text.
+
+        Raises:
+            Exception: Whatever a window's transcription raised, so the
+                caller never mistakes a partial transcript for a full one.
+        """
+        with self._lock:
+            if not self._finished:
+                if audio is not None and len(audio) > self._fed:
+                    self._append(audio[self._fed:])
+
+                # A tail shorter than the overlap is already covered
+                overlap = self.window - self.step
+                if self._next_start == 0 or self._total - self._next_start > overlap:
+                    tail = self._audio()[self._next_start:]
+                    if len(tail):
+                        self._jobs.put((tail, self._next_start > 0))
+                self._finished = True
+                self._jobs.put(None)
+
+        self._worker.join()
+        if self._error is not None:
+            raise self._error
+        return self.committed_text.strip()
+
+    def cancel(self) -> None:
+        """Discard pending windows and stop the worker."""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            while not self._jobs.empty():
+                self._jobs.get_nowait()
+            self._jobs.put(None)
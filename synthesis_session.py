@@ -0,0 +1,114 @@
+"""Incremental synthesis of one utterance from streamed text.
+
+Text is pushed as it arrives (e.g. LLM tokens); each sentence is
+synthesized on a worker as soon as it is complete, so audio keeps flowing
+while the rest of the text is still being produced.
+
+The session is sentence-granular: the moshi_mlx TTSModel only generates
+from complete scripts built by prepare_script(), and text cannot be
+appended to a generation that is already running. Sentences therefore
+play back to back in the same voice, but prosody restarts at each one.
+"""
+
+import queue
+import threading
+from typing import Callable
+
+import numpy as np
+
+from text_segmenter import SentenceSegmenter
+
+AudioCallback = Callable[[np.ndarray], None]
+
+
+class SynthesisSession:
+    """Feeds streamed text to a synthesizer one sentence at a time."""
+
+    def __init__(
+        self,
+        synthesize: Callable[[str, AudioCallback], None],
+        on_audio: AudioCallback,
+        max_chars: int = 160,
+        max_queue: int = 4,
+    ):
+        """Initialize session and start its worker.
+
+        Args:
+            synthesize: Function(text, on_audio) that speaks one unit, e.g.
+                MoshiSynthesizer.synthesize_streaming.
+            on_audio: Callback receiving each audio chunk (called on the worker).
+            max_chars: Sentences longer than this are split at clause boundaries.
+            max_queue: Units buffered ahead of synthesis. push() blocks while
+                the queue is full, so text never runs far ahead of speech.
+        """
+        self.synthesize = synthesize
+        self.on_audio = on_audio
+        self.units: list[str] = []
+        self._segmenter = SentenceSegmenter(max_chars=max_chars)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._error: BaseException | None = None
+        self._closed = False
+        self._done = object()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def text(self) -> str:
+        """Text handed to the synthesizer so far."""
+        return " ".join(self.units)
+
+    def push(self, text: str) -> None:
+        """Add a fragment of text to the utterance.
+
+        Raises:
+            RuntimeError: If the session is closed.
+            Exception: Whatever synthesis raised on the worker, so the caller
+                stops producing text that can no longer be spoken.
+        """
+        if self._closed:
+            raise RuntimeError("Synthesis session is closed")
+        for unit in self._segmenter.push(text):
+            if not self._put(unit):
+                raise self._error
+
+    def close(self, flush: bool = True, raise_error: bool = True) -> None:
+        """Finish the utterance and wait until its audio has been handed off.
+
+        Args:
+            flush: Speak the text left after the last sentence boundary.
+                Pass False when the text stream failed part-way.
+            raise_error: Re-raise a synthesis error. Pass False when the text
+                stream already failed, so its exception is the one that propagates.
+
+        Raises:
+            Exception: Whatever synthesis raised on the worker.
+        """
+        if not self._closed:
+            self._closed = True
+            tail = self._segmenter.flush()
+            if tail and flush:
+                self._put(tail)
+            self._put(self._done)
+        self._thread.join()
+        if self._error is not None and raise_error:
+            raise self._error
+
+    def _put(self, item) -> bool:
+        """Queue an item, blocking while the queue is full. False if the worker failed."""
+        while self._error is None and self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                if item is not self._done:
+                    self.units.append(item)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self) -> None:
+        while (unit := self._queue.get()) is not self._done:
+            try:
+                self.synthesize(unit, self.on_audio)
+            except Exception as e:
+                self._error = e
+                return
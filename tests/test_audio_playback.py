@@ -53,3 +53,72 @@ def test_player_can_stop():
         player.stop()
 
         mock_sd.stop.assert_called_once()
+
+
+def test_streaming_callback_pads_and_finishes():
+    """The callback should copy queued audio, pad with silence and signal the end."""
+    from audio_playback import StreamingAudioPlayer
+
+    player = StreamingAudioPlayer(sample_rate=24000, blocksize=4, buffer_sec=0.01)
+    player.add_chunk(np.ones(6, dtype=np.float32))
+    player._eof = True
+
+    outdata = np.full((4, 1), -1.0, dtype=np.float32)
+    player._audio_callback(outdata, 4, None, None)
+    np.testing.assert_array_equal(outdata[:, 0], [1, 1, 1, 1])
+    assert not player._finished.is_set()
+
+    player._audio_callback(outdata, 4, None, None)
+    np.testing.assert_array_equal(outdata[:, 0], [1, 1, 0, 0])
+    assert player._finished.is_set()
+    assert player.callback_stats()["callbacks"] == 2
+
+
+def test_streaming_callback_holds_for_prebuffer_and_counts_underruns():
+    """Playback should wait for the prebuffer, then count each gap once."""
+    from unittest.mock import MagicMock
+    from audio_playback import StreamingAudioPlayer
+
+    prebuffer = MagicMock()
+    prebuffer.target_sec.return_value = 6 / 24000
+    player = StreamingAudioPlayer(sample_rate=24000, blocksize=4, buffer_sec=0.01, prebuffer=prebuffer)
+    outdata = np.zeros((4, 1), dtype=np.float32)
+
+    player.add_chunk(np.ones(4, dtype=np.float32))
+    player._audio_callback(outdata, 4, None, None)
+    assert not outdata.any()  # Still prebuffering
+
+    player.add_chunk(np.ones(4, dtype=np.float32))
+    for _ in range(4):
+        player._audio_callback(outdata, 4, None, None)
+
+    assert player.underruns == 1
+    assert player.underrun_sec == 8 / 24000
+
+
+def test_lead_in_plays_before_prebuffer_and_is_not_measured():
+    """A filler should play at once, and only the reply should be reported to the prebuffer."""
+    from unittest.mock import MagicMock
+    from audio_playback import StreamingAudioPlayer
+
+    prebuffer = MagicMock()
+    prebuffer.target_sec.return_value = 8 / 24000
+    player = StreamingAudioPlayer(sample_rate=24000, blocksize=4, buffer_sec=0.01, prebuffer=prebuffer)
+    player._finished.set()  # No output stream in this test
+    outdata = np.zeros((4, 1), dtype=np.float32)
+
+    player.add_lead_in(np.full(6, 0.5, dtype=np.float32))
+    player._audio_callback(outdata, 4, None, None)
+    assert (outdata[:, 0] == 0.5).all()  # Plays despite the unmet prebuffer
+
+    player.add_chunk(np.ones(4, dtype=np.float32))
+    player._audio_callback(outdata, 4, None, None)
+    np.testing.assert_array_equal(outdata[:, 0], [0.5, 0.5, 0, 0])  # Reply still held
+
+    player.add_chunk(np.ones(4, dtype=np.float32))
+    player._audio_callback(outdata, 4, None, None)
+    assert (outdata[:, 0] == 1).all()
+    player.finish()
+
+    assert player.underruns == 0
+    assert prebuffer.observe.call_args.kwargs["audio_sec"] == 8 / 24000
@@ -70,3 +70,97 @@ def test_message_history_maintained():
     assert len(conv.messages) == 2
     assert conv.messages[0] == {"role": "user", "content": "Hello"}
     assert conv.messages[1] == {"role": "assistant", "content": "Hi there!"}
+
+
+def test_conversation_resumes_and_appends_history(tmp_path):
+    """A new conversation should pick up where the saved history left off."""
+    from conversation import Conversation
+    from history_store import HistoryStore
+
+    store = HistoryStore("assistant", directory=tmp_path)
+    first = Conversation(persona_manager=MagicMock(), llm_router=MagicMock(), history=store)
+    first.add_user_message("Hi")
+    first.add_assistant_message("Hello!")
+
+    second = Conversation(persona_manager=MagicMock(), llm_router=MagicMock(), history=store)
+
+    assert second.messages == [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello!"},
+    ]
+
+
+def test_history_packed_to_model_token_budget():
+    """Oldest turns should be dropped once history exceeds the model's budget."""
+    from conversation import Conversation, MESSAGE_OVERHEAD_TOKENS
+
+    mock_persona = MagicMock()
+    mock_persona.get_current.return_value = {
+        "llm": {"provider": "ollama", "model": "test", "context_length": 1500},
+        "system_prompt": ""
+    }
+    mock_router = MagicMock()
+    conv = Conversation(persona_manager=mock_persona, llm_router=mock_router)
+
+    for i in range(10):
+        conv.add_user_message(f"question {i} " + "x" * 200)
+        conv.add_assistant_message(f"answer {i} " + "y" * 200)
+    conv.add_user_message("latest question")
+
+    with patch("conversation.ModelManager") as mock_models:
+        mock_models.return_value.get_context_length.return_value = None
+        conv.get_response()
+
+    assert conv.token_budget == 1500 - 1024
+    assert conv.history_tokens <= conv.token_budget
+    assert conv.messages[0]["role"] == "user"
+    assert conv.messages[-2]["content"].startswith("answer 9")
+    assert conv.messages[-1]["content"] == "latest question"
+    assert conv.history_tokens == sum(
+        (len(m["content"]) + 3) // 4 + MESSAGE_OVERHEAD_TOKENS for m in conv.messages
+    )
+
+
+def test_history_prefix_stable_between_block_trims():
+    """After a block trim, later turns should only append to history."""
+    from conversation import Conversation
+
+    conv = Conversation(persona_manager=MagicMock(), llm_router=MagicMock())
+    conv.token_budget = 500
+
+    trims = 0
+    for i in range(20):
+        first = conv.messages[0] if conv.messages else None
+        conv.add_user_message(f"question {i} " + "x" * 100)
+        conv.add_assistant_message(f"answer {i} " + "y" * 100)
+        if first is not None and conv.messages[0] is not first:
+            trims += 1
+
+    assert conv.history_tokens <= conv.token_budget
+    assert trims < 10
+
+
+def test_repeated_query_served_from_response_cache():
+    """A repeated query in the same context should not reach the LLM again."""
+    from conversation import Conversation
+    from response_cache import ResponseCache
+
+    mock_persona = MagicMock()
+    mock_persona.current_persona_id = "assistant"
+    mock_persona.get_current.return_value = {
+        "llm": {"provider": "ollama", "model": "test"},
+        "system_prompt": "test"
+    }
+    mock_router = MagicMock()
+    mock_router.chat_stream.return_value = iter(["Nine ", "pm."])
+    cache = ResponseCache()
+
+    replies = []
+    for _ in range(2):
+        conv = Conversation(persona_manager=mock_persona, llm_router=mock_router, response_cache=cache)
+        conv.add_user_message("What time is it in Tokyo?")
+        replies.append("".join(conv.stream_response()))
+
+    assert replies == ["Nine pm.", "Nine pm."]
+    mock_router.chat_stream.assert_called_once()
+    assert cache.stats()["hits"] == 1
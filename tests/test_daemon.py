@@ -0,0 +1,139 @@
+"""Tests for resident voice daemon."""
+
+import threading
+import time
+
+import pytest
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def running_daemon(tmp_path):
+    """Serve a daemon with a mocked pipeline on a temporary socket."""
+    from daemon import VoiceDaemon
+
+    pipeline = MagicMock()
+    socket_path = tmp_path / "daemon.sock"
+    daemon = VoiceDaemon(pipeline=pipeline, socket_path=socket_path)
+
+    with patch("config.DAEMON_PID_FILE", tmp_path / "daemon.pid"):
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        for _ in range(100):
+            if socket_path.exists():
+                break
+            time.sleep(0.01)
+
+        yield daemon, pipeline, socket_path
+
+        daemon.shutdown()
+        thread.join(timeout=2)
+
+
+def test_request_returns_none_without_daemon(tmp_path):
+    """Client should report no daemon so the CLI can fall back in-process."""
+    import daemon
+
+    assert daemon.request("ping", socket_path=tmp_path / "missing.sock") is None
+
+
+def test_dictate_round_trip(running_daemon):
+    """Daemon should receive audio in memory and return the transcript."""
+    import daemon
+
+    _, pipeline, socket_path = running_daemon
+    pipeline.dictate.return_value = "hello world"
+    audio = np.linspace(-1, 1, 4800, dtype=np.float32)
+
+    response = daemon.request("dictate", audio=audio, sample_rate=24000, socket_path=socket_path)
+
+    assert response == {"ok": True, "stdout": "hello world"}
+    sent_audio, sample_rate = pipeline.dictate.call_args.args
+    assert sample_rate == 24000
+    np.testing.assert_array_equal(sent_audio, audio)
+
+
+def test_errors_are_reported(running_daemon):
+    """Pipeline errors should come back as a failed response."""
+    import daemon
+
+    _, pipeline, socket_path = running_daemon
+    pipeline.switch_persona.side_effect = ValueError("Unknown persona: nope")
+
+    response = daemon.request("persona", text="nope", socket_path=socket_path)
+
+    assert response["ok"] is False
+    assert "Unknown persona" in response["error"]
+
+
+def test_dictate_uses_daemon_capture(tmp_path):
+    """Without client audio, the daemon should use its always-on capture."""
+    from daemon import VoiceDaemon
+
+    pipeline = MagicMock()
+    pipeline.dictate.return_value = "hi"
+    recorder = MagicMock(sample_rate=24000, is_recording=True)
+    recorder.stop.return_value = np.zeros(4800, dtype=np.float32)
+    daemon = VoiceDaemon(pipeline=pipeline, socket_path=tmp_path / "d.sock", recorder=recorder)
+
+    with patch("config.STREAMING_STT", False):
+        assert daemon.handle({"command": "start"}, b"") == {"ok": True, "recording": True}
+    response = daemon.handle({"command": "dictate"}, b"")
+
+    assert response == {"ok": True, "stdout": "hi"}
+    recorder.start.assert_called_once()
+    pipeline.dictate.assert_called_once_with(recorder.stop.return_value, 24000, transcript=None)
+
+
+def test_other_commands_keep_recording(tmp_path):
+    """A persona switch while the key is held should not end the recording."""
+    from daemon import VoiceDaemon
+
+    pipeline = MagicMock()
+    pipeline.switch_persona.return_value = {"name": "Casual"}
+    recorder = MagicMock(sample_rate=24000, is_recording=True)
+    daemon = VoiceDaemon(pipeline=pipeline, socket_path=tmp_path / "d.sock", recorder=recorder)
+
+    response = daemon.handle({"command": "persona", "text": "casual"}, b"")
+
+    assert response == {"ok": True, "name": "Casual"}
+    recorder.stop.assert_not_called()
+
+
+def test_stream_from_stale_key_press_is_cancelled(tmp_path):
+    """A streaming thread that outlives its key press should not attach its transcriber."""
+    import sys
+    from daemon import VoiceDaemon
+
+    recorder = MagicMock(sample_rate=24000, is_recording=True)
+    daemon = VoiceDaemon(pipeline=MagicMock(), socket_path=tmp_path / "d.sock", recorder=recorder)
+    stt = MagicMock()
+
+    with patch("config.STREAMING_STT", False):
+        daemon.handle({"command": "start"}, b"")
+    stream_id = daemon._stream_id
+    daemon._take_stream()  # Released while the model was loading
+
+    with patch.dict(sys.modules, {"stt": stt}):
+        daemon._stream_recording(stream_id)
+
+    assert daemon._stream is None
+    stt.StreamingTranscriber.return_value.cancel.assert_called_once()
+
+
+def test_streaming_failure_falls_back_to_full_clip(tmp_path):
+    """If the streamed transcript fails, the pipeline should transcribe the clip itself."""
+    from daemon import VoiceDaemon
+
+    pipeline = MagicMock()
+    pipeline.dictate.return_value = "hi"
+    recorder = MagicMock(sample_rate=24000, is_recording=True)
+    daemon = VoiceDaemon(pipeline=pipeline, socket_path=tmp_path / "d.sock", recorder=recorder)
+    daemon._stream = MagicMock()
+    daemon._stream.finish.side_effect = RuntimeError("model crashed")
+
+    response = daemon.handle({"command": "dictate"}, b"")
+
+    assert response == {"ok": True, "stdout": "hi"}
+    pipeline.dictate.assert_called_once_with(recorder.stop.return_value, 24000, transcript=None)
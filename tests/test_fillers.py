@@ -0,0 +1,27 @@
+"""Tests for latency-masking fillers."""
+
+import numpy as np
+
+
+def test_latency_predictor_tracks_moving_average():
+    """The estimate should move toward new observations."""
+    from fillers import LatencyPredictor
+
+    predictor = LatencyPredictor(alpha=0.5)
+    predictor.observe(2.0)
+    predictor.observe(1.0)
+
+    assert predictor.estimate == 1.5
+
+
+def test_filler_bank_avoids_repeating_last_clip():
+    """Consecutive picks should not repeat a clip when there is a choice."""
+    from fillers import FillerBank
+
+    bank = FillerBank()
+    bank.render("assistant", ["One.", "Two."], lambda text: np.full(10, len(text), dtype=np.float32))
+
+    picks = [bank.pick("assistant") for _ in range(6)]
+
+    assert all(a is not b for a, b in zip(picks, picks[1:]))
+    assert bank.pick("casual") is None
@@ -0,0 +1,72 @@
+"""Tests for hands-free conversation mode."""
+
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+from ring_buffer import AudioRingBuffer
+
+SAMPLE_RATE = 16000
+
+
+class FakeRecorder:
+    """Minimal ContinuousRecorder stand-in backed by a real ring buffer."""
+
+    def __init__(self):
+        self.sample_rate = SAMPLE_RATE
+        self.ring = AudioRingBuffer(SAMPLE_RATE * 30)
+        self.start_position = None
+
+    @property
+    def is_recording(self):
+        return self.start_position is not None
+
+    def start(self, preroll_sec=None):
+        self.start_position = self.ring.position
+
+    def stop(self):
+        if self.start_position is None:
+            return np.array([], dtype=np.float32)
+        audio = self.ring.read(self.start_position)
+        self.start_position = None
+        return audio
+
+
+class FakeClock:
+    """Replaces time.sleep by writing the next 100 ms of audio into the ring."""
+
+    def __init__(self, ring, audio):
+        self.ring = ring
+        self.audio = audio
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        step = int(SAMPLE_RATE * 0.1)
+        chunk, self.audio = self.audio[:step], self.audio[step:]
+        self.ring.write(chunk if len(chunk) else np.zeros(step, dtype=np.float32))
+        self.now += 0.1
+
+
+def test_turn_runs_on_silence_and_goes_idle():
+    """A turn should run after trailing silence, then the session should go idle."""
+    from conversation import State
+    from hands_free import HandsFreeSession
+
+    t = np.arange(SAMPLE_RATE // 2) / SAMPLE_RATE
+    speech = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    audio = np.concatenate([np.zeros(SAMPLE_RATE // 2, dtype=np.float32), speech])
+
+    recorder = FakeRecorder()
+    pipeline = MagicMock()
+    session = HandsFreeSession(pipeline, recorder, silence_sec=0.5, idle_timeout_sec=1.0)
+
+    with patch("hands_free.time", FakeClock(recorder.ring, audio)):
+        session.run()
+
+    pipeline.respond.assert_called_once()
+    turn, sample_rate = pipeline.respond.call_args.args
+    assert sample_rate == SAMPLE_RATE
+    assert len(turn) >= len(speech)
+    assert session.state == State.IDLE
@@ -0,0 +1,66 @@
+"""Tests for persistent conversation history."""
+
+
+def test_tail_returns_most_recent_messages_in_order(tmp_path):
+    """Tail should return the last N messages, oldest first."""
+    from history_store import HistoryStore
+
+    store = HistoryStore("assistant", directory=tmp_path)
+    for i in range(10):
+        store.append({"role": "user", "content": f"message {i}"})
+
+    messages = store.tail(3)
+
+    assert [m["content"] for m in messages] == ["message 7", "message 8", "message 9"]
+
+
+def test_tail_reads_only_the_end_of_long_logs(tmp_path):
+    """Tail should scan back from the end across block boundaries."""
+    import history_store
+    from history_store import HistoryStore
+
+    store = HistoryStore("assistant", directory=tmp_path)
+    long_text = "x" * (history_store.READ_BLOCK // 3)
+    for i in range(50):
+        store.append(
+            {"role": "user", "content": f"{i} {long_text}"},
+            {"role": "assistant", "content": f"reply {i}"},
+        )
+
+    messages = store.tail(4)
+
+    assert [m["content"].split()[0] for m in messages] == ["48", "reply", "49", "reply"]
+    assert messages[-1]["content"] == "reply 49"
+
+
+def test_tail_of_missing_log_is_empty(tmp_path):
+    """A persona without history should load nothing."""
+    from history_store import HistoryStore
+
+    assert HistoryStore("new", directory=tmp_path).tail(5) == []
+
+
+def test_tail_skips_torn_last_line(tmp_path):
+    """A partially written record should not break loading."""
+    from history_store import HistoryStore
+
+    store = HistoryStore("assistant", directory=tmp_path)
+    store.append({"role": "user", "content": "hello"})
+    with open(store.path, "a") as f:
+        f.write('{"role": "assis')
+
+    assert store.tail(5) == [{"role": "user", "content": "hello"}]
+
+
+def test_window_resumes_from_last_trim_point(tmp_path):
+    """Window should start at the first message kept by the latest trim."""
+    from history_store import HistoryStore
+
+    store = HistoryStore("assistant", directory=tmp_path)
+    for i in range(6):
+        store.append({"role": "user", "content": f"message {i}"})
+    store.mark_window(2)
+    store.append({"role": "user", "content": "message 6"})
+
+    assert [m["content"] for m in store.window(100)] == ["message 4", "message 5", "message 6"]
+    assert [m["content"] for m in store.tail(2)] == ["message 5", "message 6"]
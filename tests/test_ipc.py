@@ -0,0 +1,35 @@
+"""Tests for Unix socket message framing."""
+
+import socket
+
+import numpy as np
+
+
+def test_audio_chunks_round_trip():
+    """Chunked audio should arrive as one contiguous float32 array."""
+    import ipc
+
+    chunks = [np.full(1024, i, dtype=np.float32) for i in range(3)]
+    left, right = socket.socketpair()
+
+    with left, right, right.makefile("rb") as rfile:
+        ipc.send_audio(left, {"ok": True}, chunks, 24000)
+        header, payload = ipc.recv_message(rfile)
+
+    audio = ipc.decode_audio(header, payload)
+    assert header["sample_rate"] == 24000
+    np.testing.assert_array_equal(audio, np.concatenate(chunks))
+
+
+def test_message_without_audio():
+    """Plain messages should carry no audio."""
+    import ipc
+
+    left, right = socket.socketpair()
+
+    with left, right, right.makefile("rb") as rfile:
+        ipc.send_message(left, {"command": "cancel"})
+        header, payload = ipc.recv_message(rfile)
+
+    assert header == {"command": "cancel"}
+    assert ipc.decode_audio(header, payload) is None
@@ -0,0 +1,24 @@
+"""Tests for adaptive playback prebuffering."""
+
+
+def test_prebuffer_grows_for_slow_producer():
+    """A producer slower than real time should get a longer start delay."""
+    from jitter import AdaptivePrebuffer
+
+    prebuffer = AdaptivePrebuffer(min_sec=0.1, max_sec=3.0)
+    prebuffer.observe(audio_sec=4.0, producer_sec=5.0, underruns=2, underrun_sec=0.4, prebuffer_sec=0.1)
+
+    # 4 s utterance at rtf 1.25 needs a 1 s lead, plus the grown margin
+    assert abs(prebuffer.target_sec() - 1.5) < 1e-9
+    assert prebuffer.history[-1]["underruns"] == 2
+
+
+def test_prebuffer_stays_minimal_for_fast_producer():
+    """Faster than real time with no underruns should keep the minimum delay."""
+    from jitter import AdaptivePrebuffer
+
+    prebuffer = AdaptivePrebuffer(min_sec=0.1, max_sec=3.0)
+    for _ in range(3):
+        prebuffer.observe(audio_sec=4.0, producer_sec=2.0, underruns=0, underrun_sec=0.0, prebuffer_sec=0.1)
+
+    assert prebuffer.target_sec() == 0.1
@@ -47,7 +47,7 @@ def test_route_to_redpill():
             "choices": [{"message": {"content": "Hello from cloud!"}}]
         }
         mock_response.raise_for_status = MagicMock()
-        mock_httpx.post.return_value = mock_response
+        mock_httpx.Client.return_value.post.return_value = mock_response
 
         response = router.chat(
             llm_config=llm_config,
@@ -71,3 +71,182 @@ def test_invalid_provider():
             messages=[{"role": "user", "content": "Hi"}],
             system_prompt="Test"
         )
+
+
+@pytest.fixture
+def openai_stub_server():
+    """Local OpenAI-compatible server that streams a canned reply as SSE."""
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests.append((self.path, body))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for token in ["Hello", " from", " stream"]:
+                chunk = {"choices": [{"delta": {"content": token}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            usage = {"prompt_tokens": 120, "prompt_tokens_details": {"cached_tokens": 96}}
+            self.wfile.write(f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", requests
+    server.shutdown()
+
+
+def test_stream_redpill_sse(openai_stub_server):
+    """Should yield tokens from server-sent events and record time to first token."""
+    from llm_router import LLMRouter
+
+    base_url, requests = openai_stub_server
+    router = LLMRouter()
+    router.redpill_base_url = base_url
+    router.redpill_api_key = "test-key"
+
+    tokens = list(router.chat_stream(
+        llm_config={"provider": "redpill", "model": "test-model"},
+        messages=[{"role": "user", "content": "Hi"}],
+        system_prompt="You are helpful."
+    ))
+
+    assert tokens == ["Hello", " from", " stream"]
+    assert router.last_ttft is not None
+    path, body = requests[0]
+    assert path == "/chat/completions"
+    assert body["stream"] is True
+    assert body["messages"][0] == {"role": "system", "content": "You are helpful."}
+    assert body["prompt_cache_key"] == router._cache_key("test-model", "You are helpful.")
+    assert router.last_usage == {"prompt_tokens": 120, "cached_tokens": 96}
+
+
+def test_stream_ollama():
+    """Should yield streamed Ollama chunks."""
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+
+    with patch("llm_router.ollama") as mock_ollama:
+        mock_ollama.chat.return_value = iter([
+            {"message": {"content": "Hi"}},
+            {"message": {"content": ""}},
+            {"message": {"content": " there"}},
+        ])
+
+        tokens = list(router.chat_stream(
+            llm_config={"provider": "ollama", "model": "llama3.1:8b"},
+            messages=[{"role": "user", "content": "Hi"}],
+            system_prompt="Test"
+        ))
+
+    assert tokens == ["Hi", " there"]
+    assert mock_ollama.chat.call_args.kwargs["stream"] is True
+
+
+def test_ollama_requests_declared_context_length():
+    """The persona's context_length should be sent as num_ctx, so prompts are not cut."""
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+    llm_config = {"provider": "ollama", "model": "llama3.1:8b", "context_length": 8192}
+
+    with patch("llm_router.ollama") as mock_ollama:
+        mock_ollama.chat.return_value = {"message": {"content": "Hello!"}}
+        router.chat(llm_config=llm_config, messages=[], system_prompt="Test")
+        mock_ollama.chat.return_value = iter([{"message": {"content": "Hi"}}])
+        list(router.chat_stream(llm_config=llm_config, messages=[], system_prompt="Test"))
+
+    for call in mock_ollama.chat.call_args_list:
+        assert call.kwargs["options"] == {"num_ctx": 8192}
+
+
+def test_redpill_reuses_pooled_client():
+    """Requests should share one keep-alive client instead of per-call connections."""
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+
+    with patch("llm_router.httpx") as mock_httpx:
+        client = mock_httpx.Client.return_value
+        client.post.return_value.json.return_value = {
+            "choices": [{"message": {"content": "ok"}}]
+        }
+
+        for _ in range(2):
+            router.chat(
+                llm_config={"provider": "redpill", "model": "test-model"},
+                messages=[{"role": "user", "content": "Hi"}],
+                system_prompt="Test"
+            )
+
+    mock_httpx.Client.assert_called_once()
+    assert client.post.call_count == 2
+
+
+def test_prewarm_opens_redpill_connection():
+    """Pre-warming should touch the pooled client only for RedPill."""
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+
+    with patch("llm_router.httpx") as mock_httpx:
+        assert router.prewarm("ollama") is None
+        router.prewarm("redpill").join(timeout=1.0)
+
+    url = mock_httpx.Client.return_value.get.call_args.args[0]
+    assert url == f"{router.redpill_base_url}/models"
+
+
+def test_preload_loads_ollama_model_in_background():
+    """Preloading should load Ollama models and skip remote providers."""
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+
+    with patch("llm_router.ollama") as mock_ollama:
+        assert router.preload({"provider": "redpill", "model": "remote"}) is None
+        router.preload(
+            {"provider": "ollama", "model": "llama3.1:8b", "context_length": 8192}, keep_alive=-1
+        ).join(timeout=1.0)
+
+    mock_ollama.generate.assert_called_once_with(
+        model="llama3.1:8b", prompt="", options={"num_ctx": 8192}, keep_alive=-1
+    )
+
+
+def test_unload_frees_ollama_model_in_background():
+    """Unloading should not block the caller on the Ollama round trip."""
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+
+    with patch("llm_router.ollama") as mock_ollama:
+        assert router.unload({"provider": "redpill", "model": "remote"}) is None
+        router.unload({"provider": "ollama", "model": "llama3.1:8b"}).join(timeout=1.0)
+
+    mock_ollama.generate.assert_called_once_with(model="llama3.1:8b", prompt="", keep_alive=0)
+
+
+def test_chat_keeps_pinned_models_pinned():
+    """Under the "all" policy, chat requests must not replace the -1 keep_alive pin."""
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+
+    with patch("llm_router.ollama") as mock_ollama, patch("config.OLLAMA_RESIDENCY", "all"):
+        mock_ollama.chat.return_value = {"message": {"content": "Hello!"}}
+        router.chat(llm_config={"provider": "ollama", "model": "a"}, messages=[], system_prompt="")
+
+    assert mock_ollama.chat.call_args.kwargs["keep_alive"] == -1
@@ -0,0 +1,184 @@
+"""Tests for the voice pipeline."""
+
+import sys
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Pipeline with mocked models and audio output."""
+    from pipeline import VoicePipeline
+
+    with patch.dict(sys.modules, {"audio_playback": MagicMock()}), \
+            patch("config.TTS_CACHE_DIR", tmp_path / "tts"):
+        p = VoicePipeline()
+        p._synthesizer = MagicMock(sample_rate=24000)
+        yield p
+
+
+def test_speak_stream_synthesizes_each_sentence(pipeline):
+    """Each completed sentence should be synthesized as it arrives."""
+    tokens = ["Hi", " there.", " How", " are", " you?"]
+
+    text = pipeline.speak_stream(iter(tokens))
+
+    assert text == "Hi there. How are you?"
+    spoken = [call.args[0] for call in pipeline._synthesizer.synthesize_streaming.call_args_list]
+    assert spoken == ["Hi there.", "How are you?"]
+
+
+def test_speak_stream_reraises_llm_errors(pipeline):
+    """Errors from the token stream should surface after playback stops."""
+    def tokens():
+        yield "Partial sentence. "
+        raise RuntimeError("stream dropped")
+
+    with pytest.raises(RuntimeError, match="stream dropped"):
+        pipeline.speak_stream(tokens())
+
+
+def test_switch_persona_swaps_resident_ollama_model(pipeline):
+    """Switching personas should preload the new local model and unload the old one."""
+    pipeline.llm_router = MagicMock()
+    pipeline.persona_manager.personas["local_a"] = {"name": "A", "llm": {"provider": "ollama", "model": "a"}}
+    pipeline.persona_manager.personas["local_b"] = {"name": "B", "llm": {"provider": "ollama", "model": "b"}}
+    pipeline.persona_manager.switch("local_a")
+
+    with patch("pipeline.config.OLLAMA_RESIDENCY", "current"):
+        pipeline.switch_persona("local_b")
+
+    pipeline.llm_router.unload.assert_called_once_with({"provider": "ollama", "model": "a"})
+    pipeline.llm_router.preload.assert_called_once_with({"provider": "ollama", "model": "b"})
+
+
+def test_speak_cache_hit_skips_tts_model(pipeline):
+    """Cached phrases should play without loading the synthesizer."""
+    import numpy as np
+    import config
+    from tts_cache import TTSCache
+
+    audio = np.linspace(-0.5, 0.5, 4800, dtype=np.float32)
+    key = TTSCache.key("Hello  there.", config.TTS_VOICE, config.TTS_REPO, config.TTS_QUANTIZE)
+    pipeline.tts_cache.put(key, [audio[:2400], audio[2400:]])
+    pipeline._synthesizer = None
+
+    pipeline.speak("Hello there.")
+
+    player = sys.modules["audio_playback"].StreamingAudioPlayer.return_value
+    np.testing.assert_array_equal(player.add_chunk.call_args.args[0], audio)
+    assert pipeline._synthesizer is None
+
+
+def test_respond_plays_filler_when_reply_predicted_slow(pipeline):
+    """A filler should be queued before the reply when latency is predicted high."""
+    import numpy as np
+
+    filler = np.ones(100, dtype=np.float32)
+    pipeline.fillers.render("assistant", ["One moment."], lambda text: filler)
+    pipeline.latency.estimate = 5.0
+    pipeline.llm_router = MagicMock()
+    pipeline.history_store = MagicMock(return_value=None)
+    pipeline.response_cache = None
+    pipeline.llm_router.chat_stream.return_value = iter(["Sure."])
+    pipeline._synthesizer.synthesize_streaming.side_effect = (
+        lambda text, on_audio: on_audio(np.zeros(100, dtype=np.float32))
+    )
+
+    audio = np.zeros(24000, dtype=np.float32)
+    audio[6000:18000] = np.sin(np.linspace(0, 1000, 12000)) * 0.3  # Speech between silence
+    pipeline.respond(audio, 24000, transcript="Hello")
+
+    player = sys.modules["audio_playback"].StreamingAudioPlayer.return_value
+    player.add_lead_in.assert_called_once_with(filler)
+    assert pipeline.latency.estimate < 5.0
+
+
+def test_filler_starts_before_transcription(pipeline):
+    """The filler should already be playing while Whisper runs."""
+    import numpy as np
+
+    filler = np.ones(100, dtype=np.float32)
+    pipeline.fillers.render("assistant", ["One moment."], lambda text: filler)
+    pipeline.latency.estimate = 5.0
+    pipeline.llm_router = MagicMock()
+    pipeline.history_store = MagicMock(return_value=None)
+    pipeline.response_cache = None
+    pipeline.llm_router.chat_stream.return_value = iter(["Sure."])
+    player = sys.modules["audio_playback"].StreamingAudioPlayer.return_value
+    player.reset_mock()
+    queued_at_stt = []
+    pipeline._transcriber = MagicMock()
+    pipeline._transcriber.transcribe.side_effect = (
+        lambda audio, sample_rate: queued_at_stt.append(player.add_lead_in.call_count) or "Hello"
+    )
+    audio = np.zeros(24000, dtype=np.float32)
+    audio[6000:18000] = np.sin(np.linspace(0, 1000, 12000)) * 0.3
+
+    pipeline.respond(audio, 24000)
+
+    assert queued_at_stt == [1]
+    player.add_lead_in.assert_called_once_with(filler)
+
+
+def test_streamed_transcript_of_silence_is_dropped(pipeline):
+    """A transcript streamed during recording should still pass the VAD check."""
+    import numpy as np
+
+    text = pipeline.dictate(np.zeros(24000, dtype=np.float32), 24000, transcript="Thank you.")
+
+    assert text == ""
+
+
+def test_respond_turns_keep_history_prefix_stable(pipeline, tmp_path):
+    """Turns that each resume history from disk should keep the same first message between trims."""
+    import numpy as np
+
+    first_messages = []
+
+    def chat_stream(llm_config, messages, system_prompt):
+        first_messages.append(messages[0]["content"])
+        return iter(["Sure."])
+
+    pipeline.llm_router = MagicMock()
+    pipeline.llm_router.chat_stream.side_effect = chat_stream
+    pipeline.response_cache = None
+    audio = np.zeros(24000, dtype=np.float32)
+    audio[6000:18000] = np.sin(np.linspace(0, 1000, 12000)) * 0.3
+
+    with patch("config.HISTORY_DIR", tmp_path / "history"), \
+            patch("config.PERSIST_HISTORY", True), \
+            patch("config.FILLERS", False), \
+            patch("conversation.ModelManager") as mock_models:
+        mock_models.return_value.get_context_length.return_value = 2000
+        mock_models.return_value.get_current_model.return_value = None
+        for i in range(30):
+            pipeline.respond(audio, 24000, transcript=f"question {i} " + "x" * 200)
+
+    changes = sum(1 for a, b in zip(first_messages, first_messages[1:]) if a != b)
+    assert first_messages[-1] != first_messages[0]  # History did get trimmed
+    assert changes <= 3
+
+
+def test_key_down_preloads_current_ollama_model(pipeline):
+    """Pressing the key should load the local model the user is about to talk to."""
+    pipeline.llm_router = MagicMock()
+    pipeline.persona_manager.personas["local"] = {"name": "L", "llm": {"provider": "ollama", "model": "a"}}
+    pipeline.persona_manager.switch("local")
+
+    with patch("pipeline.config.OLLAMA_RESIDENCY", "current"):
+        pipeline.warm_llm()
+
+    pipeline.llm_router.preload.assert_called_once_with({"provider": "ollama", "model": "a"})
+
+
+def test_reply_sentences_are_not_written_to_tts_cache(pipeline):
+    """Streamed LLM replies should not pay for cache writes between sentences."""
+    pipeline.tts_cache = MagicMock()
+    pipeline.tts_cache.get.return_value = None
+
+    pipeline.speak_stream(iter(["Hi there."]))
+
+    pipeline.tts_cache.put.assert_not_called()
+    pipeline.tts_cache.put_async.assert_not_called()
@@ -0,0 +1,39 @@
+"""Tests for polyphase resampling."""
+
+import numpy as np
+
+
+def _tone(sample_rate, seconds=1.0, freq=1000.0, delay=0.0):
+    t = (np.arange(int(sample_rate * seconds)) - delay) / sample_rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+def test_resample_24k_to_16k_preserves_tone():
+    """A tone in the passband should survive 3:2 downsampling."""
+    from resample import PolyphaseResampler, resample
+
+    out = resample(_tone(24000), 24000, 16000)
+    expected = _tone(16000, delay=PolyphaseResampler(24000, 16000).delay)
+
+    assert len(out) == 16000
+    np.testing.assert_allclose(out[200:-200], expected[200:-200], atol=1e-3)
+
+
+def test_streaming_matches_one_shot():
+    """Chunked processing should produce exactly the one-shot output."""
+    from resample import PolyphaseResampler, resample
+
+    audio = np.random.default_rng(0).standard_normal(24000).astype(np.float32)
+    resampler = PolyphaseResampler(24000, 16000)
+    chunks = [resampler.process(c) for c in np.array_split(audio, 37)]
+
+    np.testing.assert_allclose(np.concatenate(chunks), resample(audio, 24000, 16000), atol=1e-5)
+
+
+def test_high_frequencies_are_filtered():
+    """Content above the target Nyquist rate should be attenuated, not aliased."""
+    from resample import resample
+
+    out = resample(_tone(24000, freq=10000.0), 24000, 16000)
+
+    assert np.abs(out[200:-200]).max() < 0.01
@@ -0,0 +1,42 @@
+"""Tests for the LLM response cache."""
+
+from unittest.mock import patch
+
+
+def test_key_ignores_case_and_punctuation():
+    """Trivially different transcripts should share a key."""
+    from response_cache import ResponseCache
+
+    history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}]
+    a = ResponseCache.make_key("assistant", "model", history, "What time is it in Tokyo?")
+    b = ResponseCache.make_key("assistant", "model", history, "what time is it in  tokyo")
+
+    assert a == b
+    assert a != ResponseCache.make_key("tutor", "model", history, "what time is it in tokyo")
+    assert a != ResponseCache.make_key("assistant", "model", [], "what time is it in tokyo")
+
+
+def test_lru_eviction_and_stats():
+    """The least recently used entry should be evicted when full."""
+    from response_cache import ResponseCache
+
+    cache = ResponseCache(max_entries=2, ttl_sec=60)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 2}
+
+
+def test_entries_expire_after_ttl():
+    """Entries older than the TTL should miss."""
+    from response_cache import ResponseCache
+
+    cache = ResponseCache(max_entries=8, ttl_sec=10)
+    with patch("response_cache.time.monotonic", return_value=100.0):
+        cache.put("a", "A")
+    with patch("response_cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
@@ -0,0 +1,74 @@
+"""Tests for audio ring buffer."""
+
+import numpy as np
+
+
+def test_read_across_wrap():
+    """Reads spanning the end of the array should come back in order."""
+    from ring_buffer import AudioRingBuffer
+
+    ring = AudioRingBuffer(8)
+    ring.write(np.arange(6, dtype=np.float32))
+    ring.write(np.arange(6, 10, dtype=np.float32))
+
+    assert ring.position == 10
+    np.testing.assert_array_equal(ring.read(4), np.arange(4, 10))
+
+
+def test_overwritten_samples_are_clamped():
+    """Marks older than the buffer should read from the oldest sample."""
+    from ring_buffer import AudioRingBuffer
+
+    ring = AudioRingBuffer(4)
+    ring.write(np.arange(10, dtype=np.float32))
+
+    assert ring.oldest == 6
+    np.testing.assert_array_equal(ring.read(0), np.arange(6, 10))
+
+
+def test_read_with_end_position():
+    """Reads should stop at the requested end position."""
+    from ring_buffer import AudioRingBuffer
+
+    ring = AudioRingBuffer(16)
+    ring.write(np.arange(10, dtype=np.float32))
+
+    np.testing.assert_array_equal(ring.read(2, 5), [2, 3, 4])
+    assert len(ring.read(10)) == 0
+
+
+def test_playback_ring_wraps_and_reads_into_view():
+    """Reads should copy across the wrap point into a strided output view."""
+    from ring_buffer import PlaybackRingBuffer
+
+    ring = PlaybackRingBuffer(8)
+    ring.write(np.arange(6, dtype=np.float32))
+    out = np.zeros((4, 1), dtype=np.float32)
+    assert ring.read_into(out[:, 0]) == 4
+
+    ring.write(np.arange(6, 12, dtype=np.float32))  # Wraps around the end
+    out = np.zeros((10, 1), dtype=np.float32)
+    n = ring.read_into(out[:, 0])
+
+    assert n == 8
+    np.testing.assert_array_equal(out[:n, 0], np.arange(4, 12))
+    assert ring.available == 0
+
+
+def test_playback_ring_blocks_writer_until_space():
+    """A write larger than the free space should wait for the reader."""
+    import threading
+    from ring_buffer import PlaybackRingBuffer
+
+    ring = PlaybackRingBuffer(4)
+    writer = threading.Thread(target=ring.write, args=(np.arange(10, dtype=np.float32),))
+    writer.start()
+
+    received = []
+    out = np.zeros(3, dtype=np.float32)
+    while len(received) < 10:
+        n = ring.read_into(out)
+        received.extend(out[:n])
+    writer.join(timeout=1.0)
+
+    assert received == list(range(10))
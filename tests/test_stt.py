@@ -22,3 +22,81 @@ def test_transcriber_handles_empty_audio():
 
     result = transcriber.transcribe(np.array([], dtype=np.float32))
     assert result == ""
+
+
+def test_merge_overlap_drops_repeated_words():
+    """Words repeated across the window overlap should appear once."""
+    from stt import merge_overlap
+
+    merged = merge_overlap(["the", "quick", "brown"], ["Brown,", "fox", "jumps"])
+
+    assert merged == ["the", "quick", "brown", "fox", "jumps"]
+
+
+def test_streaming_transcriber_decodes_only_tail_on_finish():
+    """Complete windows should be decoded while feeding, only the tail on finish."""
+    from stt import StreamingTranscriber
+
+    transcriber = MagicMock()
+    transcriber.transcribe.side_effect = ["one two three", "three four five", "five six"]
+    stream = StreamingTranscriber(transcriber, sample_rate=16000, window_sec=4, overlap_sec=1)
+
+    speech = (0.3 * np.sin(np.arange(136000) * 0.1)).astype(np.float32)
+
+    # Two full windows ([0, 4s) and [3s, 7s)) are ready before release
+    for i in range(8):
+        stream.feed(speech[i * 16000:(i + 1) * 16000])
+    text = stream.finish(speech)
+
+    assert text == "one two three four five six"
+    lengths = [len(call.args[0]) for call in transcriber.transcribe.call_args_list]
+    assert lengths == [64000, 64000, 40000]
+
+
+def test_streaming_transcriber_skips_silent_tail():
+    """Silence after the speech should not reach Whisper."""
+    from stt import StreamingTranscriber
+
+    transcriber = MagicMock()
+    transcriber.transcribe.return_value = "hello there"
+    stream = StreamingTranscriber(transcriber, sample_rate=16000, window_sec=4, overlap_sec=1)
+    audio = np.zeros(16000 * 6, dtype=np.float32)
+    audio[:16000 * 3] = 0.3 * np.sin(np.arange(16000 * 3) * 0.1)  # Key held 3s after speech
+
+    text = stream.finish(audio)
+
+    assert text == "hello there"
+    assert transcriber.transcribe.call_count == 1
+
+
+def test_streaming_transcriber_reraises_window_errors():
+    """A failed window should fail finish() instead of returning partial text."""
+    from stt import StreamingTranscriber
+
+    transcriber = MagicMock()
+    transcriber.transcribe.side_effect = RuntimeError("model crashed")
+    stream = StreamingTranscriber(transcriber, sample_rate=16000, window_sec=4, overlap_sec=1)
+    speech = (0.3 * np.sin(np.arange(16000 * 5) * 0.1)).astype(np.float32)
+
+    stream.feed(speech)
+    with pytest.raises(RuntimeError, match="model crashed"):
+        stream.finish()
+
+
+def test_transcriber_passes_array_to_model():
+    """Audio should reach the model as an in-memory 16kHz float32 array."""
+    from stt import WhisperTranscriber
+
+    transcriber = WhisperTranscriber()
+    transcriber._model = MagicMock()
+    transcriber._model.transcribe.return_value = {"text": " hello "}
+    audio = np.full(24000, 0.25, dtype=np.float32)
+
+    assert transcriber.transcribe(audio, sample_rate=24000) == "hello"
+
+    sent = transcriber._model.transcribe.call_args.args[0]
+    assert isinstance(sent, np.ndarray)
+    assert sent.dtype == np.float32
+    assert len(sent) == 16000
+    # Caller's buffer is left untouched
+    assert audio.max() == np.float32(0.25)
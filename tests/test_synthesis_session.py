@@ -0,0 +1,60 @@
+"""Tests for incremental synthesis sessions."""
+
+import threading
+
+import numpy as np
+import pytest
+
+
+def test_session_synthesizes_sentences_while_text_arrives():
+    """A sentence should be synthesized before the rest of the text is pushed."""
+    from synthesis_session import SynthesisSession
+
+    spoken = []
+    first = threading.Event()
+
+    def synthesize(text, on_audio):
+        spoken.append(text)
+        on_audio(np.zeros(10, dtype=np.float32))
+        first.set()
+
+    chunks = []
+    session = SynthesisSession(synthesize, chunks.append)
+    for token in ["Hi", " there.", " How"]:
+        session.push(token)
+    assert first.wait(timeout=1.0)
+
+    session.push(" are you")
+    session.close()
+
+    assert spoken == ["Hi there.", "How are you"]
+    assert session.text == "Hi there. How are you"
+    assert len(chunks) == 2
+
+
+def test_session_surfaces_synthesis_errors():
+    """A synthesis failure should stop push() and be raised from close()."""
+    from synthesis_session import SynthesisSession
+
+    def synthesize(text, on_audio):
+        raise RuntimeError("tts failed")
+
+    session = SynthesisSession(synthesize, lambda chunk: None, max_queue=1)
+    with pytest.raises(RuntimeError, match="tts failed"):
+        for _ in range(100):
+            session.push("Sentence. ")
+    with pytest.raises(RuntimeError, match="tts failed"):
+        session.close()
+    session.close(raise_error=False)
+
+
+def test_session_close_without_flush_drops_tail():
+    """close(flush=False) should not speak an unfinished sentence."""
+    from synthesis_session import SynthesisSession
+
+    spoken = []
+    session = SynthesisSession(lambda text, on_audio: spoken.append(text), lambda chunk: None)
+    session.push("Done. Half a sent")
+    session.close(flush=False)
+
+    assert spoken == ["Done."]
@@ -0,0 +1,67 @@
+"""Tests for streamed text segmentation."""
+
+
+def test_sentences_released_as_they_complete():
+    """A sentence should be released once the whitespace after it arrives."""
+    from text_segmenter import SentenceSegmenter
+
+    segmenter = SentenceSegmenter()
+
+    assert segmenter.push("Hello there") == []
+    assert segmenter.push(".") == []
+    assert segmenter.push(" How are you?") == ["Hello there."]
+    assert segmenter.push(" I'm") == ["How are you?"]
+    assert segmenter.flush() == "I'm"
+
+
+def test_abbreviations_do_not_split():
+    """Periods after abbreviations, initials and decimals should not end a sentence."""
+    from text_segmenter import segment_stream
+
+    text = "Dr. Smith met J. Doe at 3.5 km, e.g. near the park. Then left."
+    units = list(segment_stream(list(text)))
+
+    assert units == ["Dr. Smith met J. Doe at 3.5 km, e.g. near the park.", "Then left."]
+
+
+def test_long_sentence_split_at_clause():
+    """Overlong sentences should be broken at a clause boundary."""
+    import re
+    from text_segmenter import segment_stream
+
+    text = "First part of a long thought, second part that keeps going and going"
+    units = list(segment_stream(re.findall(r"\S+\s*", text), max_chars=40))
+
+    assert units[0] == "First part of a long thought,"
+    assert "".join(units[1:]).startswith("second")
+
+
+def test_chunk_long_text_starts_small_and_grows():
+    """Chunks should start short, grow, keep paragraphs apart and lose no text."""
+    from text_segmenter import chunk_long_text
+
+    sentence = "This sentence is about forty characters."
+    paragraph = " ".join([sentence] * 12)
+    text = f"{paragraph}\n\n{paragraph}"
+
+    chunks = list(chunk_long_text(text, first_chars=50, max_chars=200))
+
+    assert chunks[0] == sentence
+    assert len(chunks[1]) > len(chunks[0])
+    assert all(len(c) <= 200 for c in chunks)
+    assert " ".join(chunks) == f"{paragraph} {paragraph}"
+    assert sum(c.count(".") for c in chunks) == 24
+
+
+def test_chunk_long_text_splits_overlong_sentence_mid_paragraph():
+    """A sentence longer than max_chars should be split even when more text follows it."""
+    from text_segmenter import chunk_long_text
+
+    clauses = [f"clause number {i} keeps going" for i in range(60)]
+    text = ", ".join(clauses) + ". And a short one."
+
+    chunks = list(chunk_long_text(text, first_chars=80, max_chars=400))
+
+    assert len(chunks) > 2
+    assert all(len(c) <= 400 for c in chunks)
+    assert " ".join(chunks) == text
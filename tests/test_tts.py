@@ -18,3 +18,99 @@ def test_synthesizer_handles_empty_text():
 
     result = synth.synthesize("   ")
     assert len(result) == 0
+
+
+def test_voice_conditioning_built_once_per_voice():
+    """Repeated requests for a voice should reuse its conditioning."""
+    import threading
+    from unittest.mock import MagicMock
+    from tts import MoshiSynthesizer
+
+    synth = MoshiSynthesizer.__new__(MoshiSynthesizer)
+    synth.tts_model = MagicMock(multi_speaker=True)
+    synth.cfg_coef_conditioning = None
+    synth._voice_cache = {}
+    synth._voice_lock = threading.Lock()
+
+    first = synth._conditioning("speaker/calm.wav")
+    second = synth._conditioning("speaker/calm.wav")
+
+    assert first is second
+    synth.tts_model.get_voice_path.assert_called_once_with("speaker/calm.wav")
+    synth.tts_model.make_condition_attributes.assert_called_once()
+
+
+def test_frame_decoder_decodes_all_frames_in_order():
+    """Queued frames should all be decoded, in order, on the worker."""
+    from unittest.mock import MagicMock
+    import mlx.core as mx
+    from tts import FrameDecoder
+
+    mimi = MagicMock()
+    mimi.decode_step.side_effect = lambda codes: mx.full((1, 1, 1920 * codes.shape[-1]), codes[0, 0, 0].item())
+    chunks = []
+
+    decoder = FrameDecoder(mimi, chunks.append, max_queue=2)
+    decoder.start()
+    for i in range(5):
+        decoder.put(mx.full((1, 8, 1), i / 10))
+    stats = decoder.close()
+
+    assert [round(float(c[0]), 1) for c in chunks] == [0.0, 0.1, 0.2, 0.3, 0.4]
+    assert stats["frames"] == 5
+    assert stats["max_queue_depth"] <= 2
+
+
+def _streaming_synth(generate, decode_step):
+    """Synthesizer with a mocked model for synthesize_streaming()."""
+    import threading
+    from unittest.mock import MagicMock
+    from tts import MoshiSynthesizer
+
+    synth = MoshiSynthesizer.__new__(MoshiSynthesizer)
+    synth.tts_model = MagicMock()
+    synth.tts_model.generate.side_effect = generate
+    synth.tts_model.mimi.decode_step.side_effect = decode_step
+    synth.voice = "voice"
+    synth._voice_cache = {"voice": (MagicMock(), None)}
+    synth._voice_lock = threading.Lock()
+    synth.decode_queue_size = 2
+    synth.decode_batch_frames = 1
+    synth.decode_stream = None
+    synth.cfg_is_no_prefix = synth.cfg_is_no_text = True
+    return synth
+
+
+def test_decode_error_stops_generation():
+    """A failed decode should end generation early and surface the decode error."""
+    import mlx.core as mx
+
+    generated = []
+
+    def generate(*args, on_frame, **kwargs):
+        for _ in range(100):
+            generated.append(1)
+            on_frame(mx.zeros((1, 8)))
+
+    def decode_step(codes):
+        raise ValueError("decode failed")
+
+    synth = _streaming_synth(generate, decode_step)
+
+    with pytest.raises(ValueError, match="decode failed"):
+        synth.synthesize_streaming("Hello.", lambda chunk: None)
+    assert len(generated) < 100
+
+
+def test_generation_error_is_not_replaced_by_decoder():
+    """A generation failure should propagate as is, not as a decoder error."""
+    import mlx.core as mx
+
+    def generate(*args, on_frame, **kwargs):
+        on_frame(mx.zeros((1, 8)))
+        raise RuntimeError("generate failed")
+
+    synth = _streaming_synth(generate, lambda codes: mx.zeros((1, 1, 1920)))
+
+    with pytest.raises(RuntimeError, match="generate failed"):
+        synth.synthesize_streaming("Hello.", lambda chunk: None)
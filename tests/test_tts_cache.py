@@ -0,0 +1,52 @@
+"""Tests for the synthesized speech cache."""
+
+import os
+
+import numpy as np
+
+
+def test_round_trip_and_key_normalization(tmp_path):
+    """Stored audio should come back for the same text, voice and model."""
+    from tts_cache import TTSCache
+
+    cache = TTSCache(directory=tmp_path)
+    audio = np.random.default_rng(0).uniform(-1, 1, 2400).astype(np.float32)
+    key = TTSCache.key("Hello\n  world.", "voice.wav", "repo", 8)
+    cache.put(key, [audio])
+
+    assert key == TTSCache.key("Hello world.", "voice.wav", "repo", 8)
+    assert key != TTSCache.key("Hello world.", "other.wav", "repo", 8)
+    np.testing.assert_array_equal(cache.get(key), audio)
+    assert cache.get(TTSCache.key("Goodbye.", "voice.wav", "repo", 8)) is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    """The least recently read entries should go first when over the cap."""
+    from tts_cache import TTSCache
+
+    chunk = np.zeros(1000, dtype=np.float32)  # 4000 bytes
+    cache = TTSCache(directory=tmp_path, max_bytes=10000)
+    cache.put("a", [chunk])
+    cache.put("b", [chunk])
+    os.utime(tmp_path / "a.pcm", (1, 1))
+    os.utime(tmp_path / "b.pcm", (2, 2))
+    cache.get("a")  # Now the most recent
+
+    cache.put("c", [chunk])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_running_size_total_tracks_writes(tmp_path):
+    """The size total should follow new and replaced entries without rescanning."""
+    from tts_cache import TTSCache
+
+    cache = TTSCache(directory=tmp_path)
+    cache.put("a", [np.zeros(1000, dtype=np.float32)])
+    cache.put("a", [np.zeros(500, dtype=np.float32)])
+    cache.put("b", [np.zeros(250, dtype=np.float32)])
+
+    assert cache._total_bytes == 3000
+    assert TTSCache(directory=tmp_path)._total_bytes == 3000
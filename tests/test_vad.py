@@ -0,0 +1,62 @@
+"""Tests for voice activity detection."""
+
+import numpy as np
+
+
+def _clip(silence_sec, speech_sec, sample_rate=16000):
+    """Build quiet noise around a loud tone."""
+    rng = np.random.default_rng(0)
+    silence = (rng.standard_normal(int(silence_sec * sample_rate)) * 1e-4).astype(np.float32)
+    t = np.arange(int(speech_sec * sample_rate)) / sample_rate
+    speech = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    return np.concatenate([silence, speech, silence])
+
+
+def test_trim_leading_and_trailing_silence():
+    """Silence around speech should be trimmed down to the padding."""
+    from vad import trim_silence
+
+    audio = _clip(silence_sec=1.0, speech_sec=0.5)
+    trimmed = trim_silence(audio, 16000, padding_sec=0.1)
+
+    assert abs(len(trimmed) / 16000 - 0.7) < 0.05
+
+
+def test_silent_clip_is_dropped():
+    """A clip with no speech should trim to nothing."""
+    from vad import trim_silence
+
+    audio = _clip(silence_sec=1.0, speech_sec=0.0)
+
+    assert len(trim_silence(audio, 16000)) == 0
+
+
+def test_clip_without_silence_is_kept():
+    """A clip that is speech throughout has no noise floor and should not be trimmed away."""
+    from vad import trim_silence
+
+    audio = _clip(silence_sec=0.0, speech_sec=2.0)
+
+    assert len(trim_silence(audio, 16000)) == len(audio)
+
+
+def test_short_click_is_not_speech():
+    """A burst shorter than MIN_SPEECH_SEC should not count as speech."""
+    from vad import trim_silence
+
+    audio = _clip(silence_sec=1.0, speech_sec=0.04)
+
+    assert len(trim_silence(audio, 16000)) == 0
+
+
+def test_endpointer_detects_turn_end():
+    """Endpointer should report speech start, then turn end after the silence threshold."""
+    from vad import Endpointer
+
+    endpointer = Endpointer(16000, silence_sec=0.5)
+    audio = _clip(silence_sec=1.0, speech_sec=0.5)
+    events = [endpointer.process(chunk) for chunk in np.array_split(audio, 20)]
+
+    assert events.count(Endpointer.SPEECH_START) == 1
+    assert events.count(Endpointer.TURN_END) == 1
+    assert events.index(Endpointer.SPEECH_START) < events.index(Endpointer.TURN_END)
@@ -0,0 +1,153 @@
+"""Split streamed text into speakable units.
+
+LLM output arrives a few characters at a time. The segmenter buffers it
+and releases complete sentences (or clauses, once a sentence runs long)
+so speech synthesis can start before the full reply exists.
+chunk_long_text() does the same for complete documents read aloud.
+"""
+
+import re
+from typing import Iterable, Iterator
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) then whitespace
+_SENTENCE_END = re.compile(r"""[.!?…]+["')\]]*\s+|\n+""")
+# Clause boundary used to break up long sentences
+_CLAUSE_END = re.compile(r"""[,;:—]\s+""")
+# Words whose trailing period does not end a sentence
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "approx", "no"}
+
+
+class SentenceSegmenter:
+    """Incrementally splits text into sentences or clauses."""
+
+    def __init__(self, max_chars: int = 160, min_chars: int = 1):
+        """Initialize segmenter.
+
+        Args:
+            max_chars: Sentences longer than this are split at clause boundaries.
+            min_chars: Shorter units are merged into the next one.
+        """
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def _is_boundary(self, text: str, match: re.Match) -> bool:
+        """Reject periods after abbreviations and single-letter initials."""
+        if not match.group().startswith("."):
+            return True
+        words = text[:match.start()].split()
+        last = words[-1].lower() if words else ""
+        return not (last in _ABBREVIATIONS or (len(last) == 1 and last.isalpha()))
+
+    def push(self, text: str) -> list[str]:
+        """Add text and return any units that are now complete.
+
+        Args:
+            text: Next fragment of streamed text.
+
+        Returns:
+            Completed units, in order.
+        """
+        self._buffer += text
+        units = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if not self._is_boundary(self._buffer, match):
+                continue
+            unit = self._buffer[start:match.end()].strip()
+            if len(unit) >= self.min_chars:
+                units.extend(self._split(unit))
+                start = match.end()
+        self._buffer = self._buffer[start:]
+
+        # Break an overlong sentence at its last clause boundary
+        if len(self._buffer) > self.max_chars:
+            clauses = list(_CLAUSE_END.finditer(self._buffer))
+            if clauses:
+                end = clauses[-1].end()
+                units.extend(self._split(self._buffer[:end].strip()))
+                self._buffer = self._buffer[end:]
+        return units
+
+    def _split(self, unit: str) -> list[str]:
+        """Break a unit longer than max_chars at clause boundaries.
+
+        Each piece ends at the last clause boundary that keeps it within
+        max_chars (or the first one, if even that is further away).
+        """
+        pieces = []
+        while len(unit) > self.max_chars:
+            ends = [m.end() for m in _CLAUSE_END.finditer(unit)]
+            if not ends:
+                break
+            fitting = [end for end in ends if end <= self.max_chars]
+            end = fitting[-1] if fitting else ends[0]
+            pieces.append(unit[:end].strip())
+            unit = unit[end:].strip()
+        pieces.append(unit)
+        return pieces
+
+    def flush(self) -> str | None:
+        """Return whatever text remains at end of stream."""
+        unit, self._buffer = self._buffer.strip(), ""
+        return unit or None
+
+
+def segment_stream(tokens: Iterable[str], max_chars: int = 160) -> Iterator[str]:
+    """Yield speakable units from a token stream as soon as each is complete.
+
+    Args:
+        tokens: Streamed text fragments.
+        max_chars: Sentences longer than this are split at clause boundaries.
+
+    Yields:
+        Sentences or clauses.
+    """
+    segmenter = SentenceSegmenter(max_chars=max_chars)
+    for token in tokens:
+        yield from segmenter.push(token)
+    tail = segmenter.flush()
+    if tail:
+        yield tail
+
+
+def chunk_long_text(
+    text: str,
+    first_chars: int = 80,
+    max_chars: int = 400,
+    growth: float = 2.0,
+) -> Iterator[str]:
+    """Split a document into synthesis chunks that grow in size.
+
+    The first chunk is short so audio starts quickly; later chunks are
+    larger, because each synthesis call has a fixed setup cost. Chunks
+    hold whole sentences and never span a paragraph break.
+
+    Args:
+        text: Document text, paragraphs separated by blank lines.
+        first_chars: Size limit of the first chunk.
+        max_chars: Largest chunk size. Longer sentences are split at clauses.
+        growth: Factor by which the size limit grows after each chunk.
+
+    Yields:
+        Text chunks in reading order.
+    """
+    limit = float(first_chars)
+    for paragraph in re.split(r"\n\s*\n", text):
+        segmenter = SentenceSegmenter(max_chars=max_chars)
+        sentences = segmenter.push(" ".join(paragraph.split()) + " ")
+        tail = segmenter.flush()
+        if tail:
+            sentences.append(tail)
+
+        chunk = ""
+        for sentence in sentences:
+            if chunk and len(chunk) + 1 + len(sentence) > limit:
+                yield chunk
+                limit = min(limit * growth, max_chars)
+                chunk = sentence
+            else:
+                chunk = f"{chunk} {sentence}" if chunk else sentence
+        if chunk:
+            yield chunk
+            limit = min(limit * growth, max_chars)
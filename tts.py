@@ -4,6 +4,10 @@ Based on moshi_mlx/run_tts.py - uses TTSModel for speech synthesis.
 """
 
 import json
+import queue
+import sys
+import threading
+import time
 import numpy as np
 
 import mlx.core as mx
@@ -14,6 +18,128 @@ from moshi_mlx import models
 from moshi_mlx.models.tts import TTSModel, DEFAULT_DSM_TTS_REPO, DEFAULT_DSM_TTS_VOICE_REPO
 from moshi_mlx.utils.loaders import hf_get
 
+from synthesis_session import SynthesisSession
+
+
+class FrameDecoder:
+    """Decodes Mimi frames on a worker thread while the LM keeps generating.
+
+    Frames go through a bounded queue, so generation runs at most
+    max_queue frames ahead of decoding. When decoding falls behind, up to
+    batch_frames queued frames are decoded in one call.
+    """
+
+    def __init__(self, mimi, on_audio, max_queue: int = 16, batch_frames: int = 1, stream=None):
+        """Initialize decoder.
+
+        Args:
+            mimi: Mimi codec with streaming decode_step().
+            on_audio: Callback receiving each decoded chunk (called on the worker).
+            max_queue: Frames buffered between generation and decoding.
+            batch_frames: Most frames decoded in one call.
+            stream: MLX stream for decode work. Defaults to the device's default stream.
+        """
+        self.mimi = mimi
+        self.stream = stream or mx.default_stream(mx.default_device())
+        self.on_audio = on_audio
+        self.batch_frames = max(1, batch_frames)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._error: BaseException | None = None
+        self._done = object()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._start = 0.0
+        self._decode_time = 0.0
+        self._frames = 0
+        self._depth_total = 0
+        self._depth_max = 0
+
+    def start(self) -> None:
+        """Start the worker."""
+        self._start = time.perf_counter()
+        self._thread.start()
+
+    def put(self, frame) -> None:
+        """Queue a frame of shape (batch, codebooks, 1), blocking while the queue is full.
+
+        Raises:
+            Exception: Whatever the worker raised while decoding, so the
+                caller stops generating audio that can no longer be played.
+        """
+        depth = self._queue.qsize()
+        self._depth_total += depth
+        self._depth_max = max(self._depth_max, depth)
+        while self._error is None:
+            try:
+                self._queue.put(frame, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise self._error
+
+    def close(self, raise_error: bool = True) -> dict[str, float]:
+        """Decode the remaining frames and stop the worker.
+
+        Args:
+            raise_error: Re-raise a decode error. Pass False when generation
+                already failed, so its exception is the one that propagates.
+
+        Returns:
+            Generation and decode frame rates and queue depth statistics.
+
+        Raises:
+            Exception: Whatever the worker raised while decoding.
+        """
+        while self._error is None and self._thread.is_alive():
+            try:
+                self._queue.put(self._done, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        if self._error is not None and raise_error:
+            raise self._error
+
+        elapsed = time.perf_counter() - self._start
+        frames = max(self._frames, 1)
+        return {
+            "frames": self._frames,
+            "fps": self._frames / elapsed if elapsed > 0 else 0.0,
+            "decode_fps": self._frames / self._decode_time if self._decode_time > 0 else 0.0,
+            "avg_queue_depth": self._depth_total / frames,
+            "max_queue_depth": self._depth_max,
+        }
+
+    def _run(self) -> None:
+        with mx.stream(self.stream):
+            while True:
+                frames = [self._queue.get()]
+                while len(frames) < self.batch_frames and frames[-1] is not self._done:
+                    try:
+                        frames.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                finished = frames[-1] is self._done
+                if finished:
+                    frames.pop()
+                if frames:
+                    try:
+                        self._decode(frames)
+                    except Exception as e:
+                        self._error = e
+                        return
+                if finished:
+                    return
+
+    def _decode(self, frames: list) -> None:
+        start = time.perf_counter()
+        codes = frames[0] if len(frames) == 1 else mx.concatenate(frames, axis=-1)
+        pcm = self.mimi.decode_step(codes)
+        audio = np.array(mx.clip(pcm, -1, 1)).flatten()
+        self._decode_time += time.perf_counter() - start
+        self._frames += len(frames)
+        if len(audio) > 0:
+            self.on_audio(audio)
+
 
 class MoshiSynthesizer:
     """Synthesizes speech from text using Moshi TTS."""
@@ -26,6 +152,8 @@ class MoshiSynthesizer:
         voice_repo: str | None = None,
         voice: str = "alba-mackenna/casual.wav",
         quantize: int | None = 8,
+        decode_queue_size: int = 16,
+        decode_batch_frames: int = 1,
     ):
         """Initialize synthesizer.
 
@@ -34,13 +162,21 @@ class MoshiSynthesizer:
             voice_repo: HuggingFace repo for voice embeddings.
             voice: Voice preset name.
             quantize: Quantization bits (None, 4, or 8).
+            decode_queue_size: Frames buffered between generation and Mimi decoding.
+            decode_batch_frames: Most frames decoded per call when decoding lags.
         """
         self.hf_repo = hf_repo or DEFAULT_DSM_TTS_REPO
         self.voice_repo = voice_repo or DEFAULT_DSM_TTS_VOICE_REPO
         self.voice = voice
         self.quantize = quantize
+        self.decode_queue_size = decode_queue_size
+        self.decode_batch_frames = decode_batch_frames
+        self.last_stats: dict[str, float] = {}
         self.sample_rate = self.SAMPLE_RATE
+        self._voice_cache: dict[str, tuple] = {}
+        self._voice_lock = threading.Lock()
         self._load_model()
+        self._conditioning(voice)  # Built at load time, not on the first request
 
     def _load_model(self):
         """Load TTS model."""
@@ -86,6 +222,8 @@ class MoshiSynthesizer:
             raw_config=raw_config,
         )
         self.mimi = self.tts_model.mimi
+        # Separate stream so frame decoding does not serialize behind LM steps
+        self.decode_stream = mx.new_stream(mx.default_device())
 
         # Handle CFG distillation (model was trained with it)
         self.cfg_coef_conditioning = None
@@ -98,12 +236,53 @@ class MoshiSynthesizer:
             self.cfg_is_no_text = True
             self.cfg_is_no_prefix = True
 
+    def _conditioning(self, voice: str) -> tuple:
+        """Get the condition attributes and prefix for a voice.
+
+        Resolving the voice file and building the tensors happens once per
+        voice; later requests are a dictionary lookup.
+
+        Args:
+            voice: Voice preset or file.
+
+        Returns:
+            Tuple of (condition attributes, prefixes or None).
+        """
+        with self._voice_lock:
+            cached = self._voice_cache.get(voice)
+            if cached is not None:
+                return cached
+
+            # Multi-speaker models condition on a voice embedding
+            voices = [self.tts_model.get_voice_path(voice)] if self.tts_model.multi_speaker else []
+            attributes = self.tts_model.make_condition_attributes(voices, self.cfg_coef_conditioning)
+
+            # Single-speaker models are prompted with the voice as an audio prefix
+            prefixes = None
+            if not self.tts_model.multi_speaker:
+                prefix_path = hf_get(voice, self.voice_repo, check_local_file_exists=True)
+                prefixes = [self.tts_model.get_prefix(prefix_path)]
+
+            cached = self._voice_cache[voice] = (attributes, prefixes)
+            return cached
+
+    def open_session(self, on_audio_chunk, max_chars: int = 160) -> SynthesisSession:
+        """Start an utterance whose text arrives incrementally.
+
+        Args:
+            on_audio_chunk: Callback function(np.ndarray) called with each audio chunk.
+            max_chars: Sentences longer than this are split at clause boundaries.
+
+        Returns:
+            Session to push() text into and close() when the text is complete.
+        """
+        return SynthesisSession(self.synthesize_streaming, on_audio_chunk, max_chars=max_chars)
+
     def synthesize(self, text: str) -> np.ndarray:
         """Synthesize text to audio.
 
         Args:
             text: Text to synthesize.
-
         Returns:
             Audio data as numpy array at 24kHz.
         """
@@ -113,20 +292,7 @@ class MoshiSynthesizer:
         # Prepare input
         entries = self.tts_model.prepare_script([text], padding_between=1)
 
-        # Get voice conditioning
-        if self.tts_model.multi_speaker:
-            voice_path = self.tts_model.get_voice_path(self.voice)
-            voices = [voice_path]
-        else:
-            voices = []
-
-        attributes = self.tts_model.make_condition_attributes(voices, self.cfg_coef_conditioning)
-
-        # Get prefix for single-speaker models
-        prefixes = None
-        if not self.tts_model.multi_speaker:
-            prefix_path = hf_get(self.voice, self.voice_repo, check_local_file_exists=True)
-            prefixes = [self.tts_model.get_prefix(prefix_path)]
+        attributes, prefixes = self._conditioning(self.voice)
 
         # Generate
         result = self.tts_model.generate(
@@ -177,30 +343,23 @@ class MoshiSynthesizer:
         # Prepare input
         entries = self.tts_model.prepare_script([text], padding_between=1)
 
-        # Get voice conditioning
-        if self.tts_model.multi_speaker:
-            voice_path = self.tts_model.get_voice_path(self.voice)
-            voices = [voice_path]
-        else:
-            voices = []
-
-        attributes = self.tts_model.make_condition_attributes(voices, self.cfg_coef_conditioning)
-
-        # Get prefix for single-speaker models
-        prefixes = None
-        prefix_samples = 0
-        if not self.tts_model.multi_speaker:
-            prefix_path = hf_get(self.voice, self.voice_repo, check_local_file_exists=True)
-            prefixes = [self.tts_model.get_prefix(prefix_path)]
-            prefix_samples = int(self.mimi.sample_rate * prefixes[0].shape[-1] / self.mimi.frame_rate)
+        attributes, prefixes = self._conditioning(self.voice)
 
         # Track whether we've passed the prefix
         self._streaming_frame_idx = 0
         self._prefix_frames = prefixes[0].shape[-1] if prefixes else 0
-        self._samples_sent = 0
+
+        # Decode on a worker so the next frame's generation is not blocked
+        decoder = FrameDecoder(
+            self.tts_model.mimi,
+            on_audio_chunk,
+            max_queue=self.decode_queue_size,
+            batch_frames=self.decode_batch_frames,
+            stream=self.decode_stream,
+        )
 
         def on_frame(frame):
-            """Callback for each generated frame - decode and send audio."""
+            """Callback for each generated frame - hand it to the decoder."""
             self._streaming_frame_idx += 1
 
             # Skip prefix frames (they contain the voice conditioning audio)
@@ -212,20 +371,29 @@ class MoshiSynthesizer:
             frame_copy = mx.array(frame)
             if frame_copy.ndim == 2:
                 frame_copy = frame_copy[:, :, None]
-
-            # Decode frame to PCM
-            pcm = self.tts_model.mimi.decode_step(frame_copy)
-            audio = np.array(mx.clip(pcm, -1, 1)).flatten()
-
-            if len(audio) > 0:
-                on_audio_chunk(audio)
-
-        # Generate with streaming callback
-        self.tts_model.generate(
-            [entries],
-            [attributes],
-            prefixes=prefixes,
-            cfg_is_no_prefix=self.cfg_is_no_prefix,
-            cfg_is_no_text=self.cfg_is_no_text,
-            on_frame=on_frame,
+            decoder.put(frame_copy)
+
+        # Generate with streaming callback; a decode error raised from
+        # on_frame stops generation early
+        decoder.start()
+        try:
+            self.tts_model.generate(
+                [entries],
+                [attributes],
+                prefixes=prefixes,
+                cfg_is_no_prefix=self.cfg_is_no_prefix,
+                cfg_is_no_text=self.cfg_is_no_text,
+                on_frame=on_frame,
+            )
+        except BaseException:
+            decoder.close(raise_error=False)
+            raise
+        self.last_stats = decoder.close()
+
+        stats = self.last_stats
+        print(
+            f"TTS: {stats['frames']} frames at {stats['fps']:.1f} fps "
+            f"(decode {stats['decode_fps']:.1f} fps, queue avg {stats['avg_queue_depth']:.1f} "
+            f"max {stats['max_queue_depth']})",
+            file=sys.stderr
         )
@@ -0,0 +1,150 @@
+"""Content-addressed on-disk cache of synthesized speech.
+
+Audio is stored as raw little-endian float32 PCM, one file per key, where
+the key hashes the normalized text together with everything that changes
+the voice (model repo, quantization and voice). Reads refresh the file's
+mtime, and the oldest files are evicted once the cache exceeds its size cap.
+The cache keeps a running size total, so the directory is only scanned
+when something has to be evicted.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+import config
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so reflowed text maps to the same audio."""
+    return " ".join(text.split())
+
+
+class TTSCache:
+    """PCM cache with a disk size cap and least-recently-used eviction."""
+
+    def __init__(self, directory: Path | None = None, max_bytes: int | None = None):
+        """Initialize cache.
+
+        Args:
+            directory: Cache directory. Defaults to config.TTS_CACHE_DIR.
+            max_bytes: Disk size cap. Defaults to config.TTS_CACHE_MAX_MB.
+        """
+        self.directory = directory or config.TTS_CACHE_DIR
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = config.TTS_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        for tmp in self.directory.glob("*.tmp"):
+            tmp.unlink(missing_ok=True)  # Left by a process that exited mid-write
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def key(text: str, voice: str, hf_repo: str, quantize: int | None) -> str:
+        """Build the cache key for a synthesis request.
+
+        Args:
+            text: Text to speak.
+            voice: Voice preset.
+            hf_repo: TTS model repo.
+            quantize: Quantization bits, or None.
+
+        Returns:
+            Hex digest naming the cached file.
+        """
+        parts = [hf_repo, str(quantize), voice, normalize_text(text)]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pcm"
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Load cached audio.
+
+        Args:
+            key: Key from key().
+
+        Returns:
+            Audio samples, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            audio = np.fromfile(path, dtype="<f4")
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None
+        return audio
+
+    def put(self, key: str, chunks: list[np.ndarray]) -> None:
+        """Store synthesized audio.
+
+        The file is written under a temporary name and renamed into place,
+        so readers never see a partial entry.
+
+        Args:
+            key: Key from key().
+            chunks: Audio chunks in playback order.
+        """
+        if not chunks:
+            return
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(np.asarray(chunk, dtype="<f4").tobytes())
+            size = os.path.getsize(tmp)
+            with self._lock:
+                try:
+                    self._total_bytes -= path.stat().st_size  # Replacing an entry
+                except FileNotFoundError:
+                    pass
+                os.replace(tmp, path)
+                self._total_bytes += size
+        except OSError as e:
+            print(f"TTS cache write failed: {e}", file=sys.stderr)
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            return
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def put_async(self, key: str, chunks: list[np.ndarray]) -> None:
+        """Store synthesized audio on a background thread.
+
+        Keeps the file write (and any eviction) off the synthesis path.
+
+        Args:
+            key: Key from key().
+            chunks: Audio chunks in playback order. Not modified afterwards.
+        """
+        threading.Thread(target=self.put, args=(key, chunks), daemon=True).start()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """(mtime, size, path) of every cached file."""
+        entries = []
+        for path in self.directory.glob("*.pcm"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used files until under the size cap."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+            self._total_bytes = total
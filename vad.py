@@ -0,0 +1,168 @@
+"""Energy-based voice activity detection.
+
+Frames are scored by RMS level in dBFS with a threshold that adapts to
+the clip's noise floor. All frame math is vectorized NumPy, so trimming
+a clip costs far less than sending its silence through Whisper.
+"""
+
+import numpy as np
+
+import config
+
+FRAME_MS = 20  # Analysis frame length
+NOISE_PERCENTILE = 10  # Quietest frames estimate the noise floor
+NOISE_MARGIN_DB = 12.0  # Speech must be this far above the noise floor
+NOISE_FLOOR_MAX_DB = -35.0  # Louder "floors" are speech, not background noise
+MIN_SPEECH_SEC = 0.1  # Shorter bursts (clicks, key noise) are ignored
+
+
+def frame_levels(audio: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """Compute per-frame RMS level in dBFS.
+
+    Args:
+        audio: Mono audio samples.
+        sample_rate: Sample rate of audio.
+        frame_ms: Frame length in milliseconds.
+
+    Returns:
+        Level of each complete frame in dB.
+    """
+    frame = sample_rate * frame_ms // 1000
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return np.array([], dtype=np.float32)
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame
+    return (10 * np.log10(power + 1e-12)).astype(np.float32)
+
+
+def speech_mask(levels: np.ndarray, threshold_db: float | None = None) -> np.ndarray:
+    """Classify frames as speech.
+
+    Args:
+        levels: Per-frame levels from frame_levels().
+        threshold_db: Absolute minimum speech level. Defaults to config.VAD_THRESHOLD_DB.
+
+    Returns:
+        Boolean array, True for speech frames.
+    """
+    if len(levels) == 0:
+        return np.zeros(0, dtype=bool)
+    threshold_db = config.VAD_THRESHOLD_DB if threshold_db is None else threshold_db
+    noise_floor, loud = np.percentile(levels, [NOISE_PERCENTILE, 100 - NOISE_PERCENTILE])
+    if loud - noise_floor < NOISE_MARGIN_DB:
+        # No quiet frames to estimate a floor from (e.g. a clip that is all speech)
+        return levels > threshold_db
+    noise_floor = min(noise_floor, NOISE_FLOOR_MAX_DB)
+    return levels > max(threshold_db, noise_floor + NOISE_MARGIN_DB)
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int,
+    padding_sec: float | None = None,
+    threshold_db: float | None = None,
+) -> np.ndarray:
+    """Trim leading and trailing silence.
+
+    Args:
+        audio: Mono audio samples.
+        sample_rate: Sample rate of audio.
+        padding_sec: Audio kept around the detected speech. Defaults to config.VAD_PADDING_SEC.
+        threshold_db: Absolute minimum speech level. Defaults to config.VAD_THRESHOLD_DB.
+
+    Returns:
+        View of the speech region, or an empty array if the clip is silent.
+    """
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    mask = speech_mask(frame_levels(audio, sample_rate), threshold_db)
+
+    frame = sample_rate * FRAME_MS // 1000
+    if mask.sum() * frame < MIN_SPEECH_SEC * sample_rate:
+        return audio[:0]
+
+    speech = np.flatnonzero(mask)
+    padding = int((config.VAD_PADDING_SEC if padding_sec is None else padding_sec) * sample_rate)
+    start = max(0, speech[0] * frame - padding)
+    end = min(len(audio), (speech[-1] + 1) * frame + padding)
+    return audio[start:end]
+
+
+class Endpointer:
+    """Streaming end-of-turn detection for hands-free listening.
+
+    Tracks the noise floor as audio arrives and reports when speech
+    starts and when it has been followed by enough silence to end the turn.
+    """
+
+    SPEECH_START = "speech_start"
+    TURN_END = "turn_end"
+
+    def __init__(
+        self,
+        sample_rate: int,
+        silence_sec: float | None = None,
+        threshold_db: float | None = None,
+    ):
+        """Initialize endpointer.
+
+        Args:
+            sample_rate: Sample rate of fed audio.
+            silence_sec: Trailing silence that ends a turn. Defaults to config.SILENCE_THRESHOLD_SEC.
+            threshold_db: Absolute minimum speech level. Defaults to config.VAD_THRESHOLD_DB.
+        """
+        self.sample_rate = sample_rate
+        self.frame = sample_rate * FRAME_MS // 1000
+        silence_sec = config.SILENCE_THRESHOLD_SEC if silence_sec is None else silence_sec
+        self.threshold_db = config.VAD_THRESHOLD_DB if threshold_db is None else threshold_db
+        self._silence_frames = int(silence_sec * 1000 / FRAME_MS)
+        self._min_speech_frames = max(1, int(MIN_SPEECH_SEC * 1000 / FRAME_MS))
+        self._noise_db: float | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new turn, keeping the noise floor estimate."""
+        self._remainder = np.array([], dtype=np.float32)
+        self._speech_run = 0
+        self._silence_run = 0
+        self.in_speech = False
+
+    def process(self, audio: np.ndarray) -> str | None:
+        """Feed captured audio.
+
+        Args:
+            audio: Next chunk of mono audio.
+
+        Returns:
+            SPEECH_START, TURN_END, or None if nothing changed.
+        """
+        audio = np.concatenate((self._remainder, np.asarray(audio, dtype=np.float32).reshape(-1)))
+        levels = frame_levels(audio, self.sample_rate)
+        self._remainder = audio[len(levels) * self.frame:]
+
+        event = None
+        for level in levels:
+            threshold = self.threshold_db
+            if self._noise_db is not None:
+                threshold = max(threshold, self._noise_db + NOISE_MARGIN_DB)
+            is_speech = level > threshold
+            if not is_speech:
+                # Track the noise floor from non-speech frames only
+                if self._noise_db is None:
+                    self._noise_db = float(level)
+                else:
+                    self._noise_db = 0.95 * self._noise_db + 0.05 * float(level)
+
+            if not self.in_speech:
+                self._speech_run = self._speech_run + 1 if is_speech else 0
+                if self._speech_run >= self._min_speech_frames:
+                    self.in_speech = True
+                    self._silence_run = 0
+                    event = self.SPEECH_START
+            else:
+                self._silence_run = 0 if is_speech else self._silence_run + 1
+                if self._silence_run >= self._silence_frames:
+                    self.in_speech = False
+                    self._speech_run = 0
+                    return self.TURN_END
+        return event